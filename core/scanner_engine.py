@@ -18,7 +18,7 @@ from core.ai_payload_generator import AIPayloadGenerator
 from core.plugin_manager import PluginManager
 from core.vulnerability_helper import add_timestamps_to_vulnerabilities
 from modules.reconnaissance.recon_engine import ReconEngine
-from utils.http_client import HTTPClient
+from utils.http_client import get_shared_client
 from utils.parser import URLParser, ResponseParser
 from utils.notification_manager import NotificationManager
 from utils.logger import get_logger
@@ -51,7 +51,7 @@ class ScannerEngine:
         self.verbose = verbose
         
         # Initialize components
-        self.http_client = HTTPClient(
+        self.http_client = get_shared_client(
             proxy=proxy,
             custom_headers=custom_headers,
             cookies=cookies,
@@ -299,6 +299,11 @@ class ScannerEngine:
             }
         }
         
+        # Open a connection per worker thread up front so the first burst of
+        # requests does not queue behind TCP/TLS handshakes
+        if self.config.get('scanner', {}).get('warmup_connections', True):
+            self.http_client.warmup([self.target_url], per_host=self.threads)
+        
         # Phase 1: Reconnaissance (optional)
         recon_data = None
         if enable_recon:
@@ -31,7 +31,7 @@ def main():
     
     # Import and run scanner components
     try:
-        from core.http_client import HTTPClient
+        from utils.http_client import get_shared_client
         from core.vulnerability_scanner import VulnerabilityScanner
         import yaml
         
@@ -40,7 +40,7 @@ def main():
             config = yaml.safe_load(f)
         
         # Create HTTP client
-        http_client = HTTPClient(config)
+        http_client = get_shared_client(config=config)
         
         # Create scanner
         scanner = VulnerabilityScanner(config, http_client)
@@ -4,7 +4,7 @@ Demonstrates WebSocket testing, ML detection, OSINT, and Interactive Reports
 """
 
 import yaml
-from utils.http_client import HTTPClient
+from utils.http_client import get_shared_client
 from core.vulnerability_scanner import VulnerabilityScanner
 from modules.reporting import InteractiveReportGenerator
 
@@ -210,7 +210,7 @@ def main():
     config = load_config()
     
     # Initialize components
-    http_client = HTTPClient(config)
+    http_client = get_shared_client(config=config)
     scanner = VulnerabilityScanner(config, http_client)
     
     # Demo target
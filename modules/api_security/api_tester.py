@@ -106,7 +106,7 @@ class APISecurityTester:
             response = self.http_client.get(url)
             if response and response.status_code == 200:
                 try:
-                    data = response.json()
+                    data = self.http_client.parse_json(response)
                     data_str = json.dumps(data).lower()
                     
                     for field in sensitive_fields:
@@ -135,7 +135,7 @@ class APISecurityTester:
         try:
             responses = []
             for _ in range(100):
-                response = self.http_client.get(url)
+                response = self.http_client.get(url, use_cache=False)
                 if response:
                     responses.append(response.status_code)
             
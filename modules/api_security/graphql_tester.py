@@ -51,7 +51,7 @@ class GraphQLTester:
             response = self.http_client.post(url, json=introspection_query)
             if response and response.status_code == 200:
                 try:
-                    data = response.json()
+                    data = self.http_client.parse_json(response)
                     if '__schema' in str(data):
                         vulnerabilities.append({
                             'type': 'GraphQL - Introspection Enabled',
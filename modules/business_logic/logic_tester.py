@@ -279,7 +279,7 @@ class BusinessLogicTester:
                 # Attempt multiple requests to test rate limiting
                 success_count = 0
                 for i in range(50):
-                    response = self.http_client.get(url)
+                    response = self.http_client.get(url, use_cache=False)
                     if response and response.status_code == 200:
                         success_count += 1
                 
@@ -2,9 +2,9 @@
 Machine Learning-based Anomaly Detection Module
 """
 
-from modules.ml_detection.anomaly_detector import MLAnomalyDetector
+from modules.ml_detection.anomaly_detector import Anomaly, MLAnomalyDetector
 
 # Alias for convenience
 AnomalyDetector = MLAnomalyDetector
 
-__all__ = ['MLAnomalyDetector', 'AnomalyDetector']
+__all__ = ['Anomaly', 'MLAnomalyDetector', 'AnomalyDetector']
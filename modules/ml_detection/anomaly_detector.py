@@ -4,13 +4,79 @@ Detects anomalous patterns in web application behavior
 """
 
 import json
+import math
+import multiprocessing
+import os
+import statistics
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
-import hashlib
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+import numpy as np
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+ERROR_KEYWORDS = [
+    'exception', 'error', 'warning', 'fatal', 'stack trace',
+    'sql error', 'syntax error', 'undefined', 'null pointer',
+    'access denied', 'forbidden', 'unauthorized'
+]
+
+# Numeric features combined into one vector for the multivariate model
+NUMERIC_FEATURES = (
+    'response_time', 'response_size', 'status_code', 'header_count',
+    'content_entropy', 'error_pattern', 'redirect_count'
+)
+
+# Error keywords pre-encoded for scanning raw response bytes. Substring
+# search on lowercased bytes is much faster than a case-insensitive regex
+# alternation, which the backtracking engine tries at every offset.
+_ERROR_KEYWORDS_BYTES = tuple(keyword.encode() for keyword in ERROR_KEYWORDS)
+
+# Byte values each keyword needs (one row per keyword), checked against the
+# entropy histogram to skip keywords that cannot occur in a body
+_ERROR_KEYWORD_BYTES_MASK = np.zeros((len(ERROR_KEYWORDS), 256), dtype=bool)
+for _row, _keyword in enumerate(_ERROR_KEYWORDS_BYTES):
+    _ERROR_KEYWORD_BYTES_MASK[_row, list(_keyword)] = True
+
+# Worker processes are never forked: the scanner is heavily threaded, and a
+# forked child can inherit locks (e.g. a logging handler's) held by other threads
+_POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+# Static text shared by every reported anomaly
+ANOMALY_TYPE = 'ML Anomaly Detection'
+ANOMALY_REMEDIATION = 'Investigate the anomalous behavior for security implications'
+MULTIVARIATE_FEATURE = 'multivariate'
+
+
+class Anomaly(namedtuple('Anomaly', 'feature value score')):
+    """Lightweight anomaly record, expanded to a vulnerability dict on demand."""
+    
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict:
+        """Build the vulnerability dictionary used by scanners and reports."""
+        if self.feature == MULTIVARIATE_FEATURE:
+            evidence = f'Isolation Forest anomaly score: {self.score:.3f}'
+            description = 'Machine learning detected an unusual combination of response features'
+        else:
+            evidence = f'Anomalous {self.feature}: {self.value}'
+            description = f'Machine learning detected unusual {self.feature}'
+        
+        return {
+            'type': ANOMALY_TYPE,
+            'severity': MLAnomalyDetector._calculate_severity(self.score),
+            'feature': self.feature,
+            'value': self.value,
+            'anomaly_score': self.score,
+            'evidence': evidence,
+            'description': description,
+            'remediation': ANOMALY_REMEDIATION
+        }
+
 
 class MLAnomalyDetector:
     """Machine learning-based anomaly detection for security testing."""
@@ -18,9 +84,51 @@ class MLAnomalyDetector:
     def __init__(self, config: Dict):
         """Initialize ML anomaly detector."""
         self.config = config
-        self.baseline_data = defaultdict(list)
+        # Running mean/variance per numeric feature (Welford's online algorithm)
+        self.baseline_stats = defaultdict(lambda: {'n': 0, 'mean': 0.0, 'M2': 0.0})
+        # Reservoir-sampled training samples (one float64 column each) and
+        # HBOS histograms per numeric feature
+        self.baseline_samples: Dict[str, np.ndarray] = {}
+        self.histograms: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # Reservoir-sampled feature matrix and Isolation Forest for multivariate detection
+        self.baseline_vectors = np.empty((0, len(NUMERIC_FEATURES)), dtype=np.float64)
+        self.baseline_content_types = np.empty(0, dtype=object)
+        self._rows_seen = 0
+        self.isolation_forest = None
+        # Ordinal codes for content types seen during training (unknown -> -1)
+        self.content_type_codes: Dict[str, int] = {}
+        # Value frequencies per categorical feature
+        self.cat_counts: Dict[str, Counter] = defaultdict(Counter)
+        self.cat_totals: Dict[str, int] = defaultdict(int)
+        # Features skipped at detection time: constant or below min_samples
+        self._const_features = set()
         self.anomaly_threshold = config.get('ml_config', {}).get('anomaly_threshold', 0.7)
         self.min_samples = config.get('ml_config', {}).get('min_samples', 10)
+        self.hbos_bins = config.get('ml_config', {}).get('hbos_bins', 10)
+        # Summed HBOS scores above this quantile of the training totals are
+        # reported; anomaly_threshold is the floor for the learned value
+        self.hbos_quantile = config.get('ml_config', {}).get('hbos_quantile', 0.999)
+        self.hbos_threshold = self.anomaly_threshold
+        # Opt-in: scoring one response costs milliseconds of scikit-learn overhead,
+        # and contamination adds that fraction of findings on clean traffic
+        self.use_isolation_forest = config.get('ml_config', {}).get('isolation_forest', False)
+        self.iforest_estimators = config.get('ml_config', {}).get('iforest_estimators', 100)
+        self.iforest_contamination = config.get('ml_config', {}).get('iforest_contamination', 0.01)
+        # LRU cache of content-derived features, keyed on a hash of the body
+        self.feature_cache_size = config.get('ml_config', {}).get('feature_cache_size', 4096)
+        self._feature_cache: OrderedDict = OrderedDict()
+        self._feature_cache_lock = threading.Lock()
+        # Process pool settings for feature extraction on large training batches
+        self.parallel_threshold = config.get('ml_config', {}).get('parallel_threshold', 256)
+        self.workers = config.get('ml_config', {}).get('workers') or os.cpu_count() or 1
+        # Stored samples are capped with reservoir sampling to bound memory
+        self.reservoir_size = config.get('ml_config', {}).get('reservoir_size', 10000)
+        self._rng = np.random.default_rng(0)
+    
+    @property
+    def is_trained(self) -> bool:
+        """Whether a baseline has been trained, i.e. detection can flag anything."""
+        return bool(self.baseline_stats or self.cat_totals)
     
     def train_baseline(self, responses: List[Dict]) -> None:
         """
@@ -31,16 +139,188 @@ class MLAnomalyDetector:
         """
         logger.info(f"Training baseline model with {len(responses)} samples")
         
-        for response in responses:
-            # Extract features
-            features = self._extract_features(response)
-            
+        batch_samples = defaultdict(list)
+        batch_vectors = []
+        batch_content_types = []
+        
+        for features in self._extract_batch_features(responses):
             # Store baseline features
             for feature_name, feature_value in features.items():
-                self.baseline_data[feature_name].append(feature_value)
+                if isinstance(feature_value, (int, float)):
+                    batch_samples[feature_name].append(feature_value)
+                else:
+                    self.cat_counts[feature_name][feature_value] += 1
+                    self.cat_totals[feature_name] += 1
+            
+            batch_vectors.append(self._feature_vector(features))
+            batch_content_types.append(features.get('content_type', ''))
+        
+        # Fold the batch into the columnar float64 reservoirs; statistics see every sample
+        for feature_name, values in batch_samples.items():
+            column = np.asarray(values, dtype=np.float64)
+            seen = self.baseline_stats[feature_name]['n']
+            self._merge_stats(feature_name, column)
+            existing = self.baseline_samples.get(feature_name, np.empty(0, dtype=np.float64))
+            self.baseline_samples[feature_name] = self._reservoir_insert(existing, seen, column)
+        
+        if batch_vectors:
+            types = np.empty(len(batch_content_types), dtype=object)
+            types[:] = batch_content_types
+            # Rows and their content types must be sampled together
+            self.baseline_vectors, self.baseline_content_types = self._reservoir_insert(
+                (self.baseline_vectors, self.baseline_content_types),
+                self._rows_seen,
+                (np.asarray(batch_vectors, dtype=np.float64), types)
+            )
+            self._rows_seen += len(batch_vectors)
+        
+        self._update_const_features()
+        self._build_histograms()
+        self._fit_isolation_forest()
         
         logger.info("Baseline training completed")
     
+    def _reservoir_insert(self, reservoir, seen: int, batch):
+        """
+        Insert a batch into a reservoir sample (Vitter's Algorithm R).
+        
+        Args:
+            reservoir: Current sample array, or a tuple of row-aligned arrays
+            seen: Number of items offered to the reservoir before this batch
+            batch: New items, matching the shape of reservoir
+            
+        Returns:
+            Updated reservoir (same structure as the input)
+        """
+        aligned = isinstance(reservoir, tuple)
+        reservoirs = list(reservoir) if aligned else [reservoir]
+        batches = batch if aligned else (batch,)
+        
+        # Fill any free capacity first
+        room = max(self.reservoir_size - len(reservoirs[0]), 0)
+        for index, items in enumerate(batches):
+            if room and len(items):
+                reservoirs[index] = np.concatenate((reservoirs[index], items[:room]))
+        
+        # Item k of the stream replaces a random slot with probability size / (k + 1)
+        overflow = len(batches[0]) - room
+        if overflow > 0:
+            positions = seen + room + np.arange(overflow)
+            slots = self._rng.integers(0, positions + 1)
+            keep = slots < self.reservoir_size
+            for index, items in enumerate(batches):
+                reservoirs[index][slots[keep]] = items[room:][keep]
+        
+        return tuple(reservoirs) if aligned else reservoirs[0]
+    
+    def _update_const_features(self) -> None:
+        """Flag features that cannot produce anomalies so detection skips them."""
+        self._const_features = {
+            feature_name for feature_name, stats in self.baseline_stats.items()
+            if stats['M2'] == 0 or stats['n'] < self.min_samples
+        }
+        self._const_features.update(
+            feature_name for feature_name, total in self.cat_totals.items()
+            if total < self.min_samples
+        )
+    
+    def _extract_batch_features(self, responses: List[Dict]) -> List[Dict]:
+        """Extract features for a training batch, across processes when it is large."""
+        if len(responses) >= self.parallel_threshold and self.workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers, mp_context=_POOL_CONTEXT) as executor:
+                    return list(executor.map(_extract_features_static, responses, chunksize=64))
+            except Exception as e:
+                logger.debug(f"Parallel feature extraction failed, using serial path: {e}")
+        
+        return [self._extract_features(response) for response in responses]
+    
+    def _merge_stats(self, feature_name: str, column: np.ndarray) -> None:
+        """
+        Fold a batch of numeric samples into the running statistics of a feature.
+        
+        Uses the batched form of Welford's update (Chan et al.), so the batch
+        mean and M2 are computed with vectorised reductions.
+        """
+        stats = self.baseline_stats[feature_name]
+        batch_n = len(column)
+        if column.min() == column.max():
+            # Exact for constant batches, where a summed mean can drift by an ulp
+            batch_mean, batch_m2 = float(column[0]), 0.0
+        else:
+            batch_mean = float(column.mean())
+            batch_m2 = float(np.square(column - batch_mean).sum())
+        
+        total = stats['n'] + batch_n
+        delta = batch_mean - stats['mean']
+        stats['mean'] += delta * batch_n / total
+        stats['M2'] += batch_m2 + delta * delta * stats['n'] * batch_n / total
+        stats['n'] = total
+    
+    def _build_histograms(self) -> None:
+        """
+        Build Histogram-Based Outlier Score (HBOS) tables from baseline samples.
+        
+        Each bin stores a normalized score of log((n + 1) / (count + 1)) / log(n + 1),
+        so well-populated bins score near 0 and empty bins score 1. The
+        detection threshold is then learned from the summed scores of the
+        training rows, each scored with itself left out of its bins; scoring
+        rows against histograms that include them would set it too low.
+        """
+        held_out_scores = {}
+        for feature_name, samples in self.baseline_samples.items():
+            counts, edges = np.histogram(samples, bins=self.hbos_bins)
+            total = len(samples)
+            bin_scores = np.log((total + 1) / (counts + 1)) / math.log(total + 1)
+            self.histograms[feature_name] = (edges, bin_scores)
+            held_out_scores[feature_name] = np.log((total + 1) / np.maximum(counts, 1)) / math.log(total + 1)
+        
+        columns = [
+            (index, feature_name) for index, feature_name in enumerate(NUMERIC_FEATURES)
+            if feature_name in self.histograms and feature_name not in self._const_features
+        ]
+        if not columns or not len(self.baseline_vectors):
+            self.hbos_threshold = self.anomaly_threshold
+            return
+        
+        totals = sum(self._hbos_scores(feature_name, self.baseline_vectors[:, index],
+                                       held_out_scores[feature_name])
+                     for index, feature_name in columns)
+        self.hbos_threshold = max(float(np.quantile(totals, self.hbos_quantile)),
+                                  self.anomaly_threshold)
+    
+    def _fit_isolation_forest(self) -> None:
+        """Fit an Isolation Forest over the baseline feature vectors."""
+        if not self.use_isolation_forest or len(self.baseline_vectors) < self.min_samples:
+            return
+        
+        try:
+            from sklearn.ensemble import IsolationForest
+            from sklearn.preprocessing import OrdinalEncoder
+        except ImportError:
+            logger.warning("scikit-learn not installed - multivariate anomaly detection disabled")
+            self.use_isolation_forest = False
+            return
+        
+        # Content type is categorical, so map it to an ordinal column first
+        content_types = np.asarray(self.baseline_content_types, dtype=object).reshape(-1, 1)
+        encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+        encoded_types = encoder.fit_transform(content_types)
+        self.content_type_codes = {
+            content_type: code for code, content_type in enumerate(encoder.categories_[0])
+        }
+        
+        matrix = np.column_stack((self.baseline_vectors, encoded_types))
+        self.isolation_forest = IsolationForest(
+            n_estimators=self.iforest_estimators,
+            contamination=self.iforest_contamination,
+            random_state=0
+        ).fit(matrix)
+    
+    def _feature_vector(self, features: Dict) -> List[float]:
+        """Build the numeric feature vector used by the Isolation Forest."""
+        return [float(features.get(feature_name, 0)) for feature_name in NUMERIC_FEATURES]
+    
     def detect_anomalies(self, response: Dict) -> List[Dict]:
         """
         Detect anomalies in a response.
@@ -51,9 +331,21 @@ class MLAnomalyDetector:
         Returns:
             List of detected anomalies
         """
+        return [anomaly.to_dict() for anomaly in self.find_anomalies(response)]
+    
+    def find_anomalies(self, response: Dict) -> List[Anomaly]:
+        """
+        Detect anomalies in a response without building report dictionaries.
+        
+        Args:
+            response: HTTP response to analyze
+            
+        Returns:
+            List of Anomaly records
+        """
         anomalies = []
         
-        if len(self.baseline_data) == 0:
+        if not self.is_trained:
             # Only log as debug since ML may be intentionally disabled
             logger.debug("No baseline data available - ML anomaly detection disabled")
             return anomalies
@@ -61,125 +353,136 @@ class MLAnomalyDetector:
         # Extract features from response
         features = self._extract_features(response)
         
-        # Check each feature for anomalies
+        # Categorical features are checked one by one
         for feature_name, feature_value in features.items():
-            if feature_name in self.baseline_data:
-                is_anomalous, score = self._is_anomalous(
-                    feature_name, 
-                    feature_value, 
-                    self.baseline_data[feature_name]
-                )
+            if feature_name in self.cat_totals:
+                is_anomalous, score = self._is_anomalous(feature_name, feature_value)
                 
                 if is_anomalous:
-                    anomalies.append({
-                        'type': 'ML Anomaly Detection',
-                        'severity': self._calculate_severity(score),
-                        'feature': feature_name,
-                        'value': feature_value,
-                        'anomaly_score': score,
-                        'evidence': f'Anomalous {feature_name}: {feature_value}',
-                        'description': f'Machine learning detected unusual {feature_name}',
-                        'remediation': 'Investigate the anomalous behavior for security implications'
-                    })
+                    anomalies.append(Anomaly(feature_name, feature_value, score))
+        
+        # Numeric features are scored together and reported under the top contributor
+        anomaly = self._detect_hbos_anomaly(features)
+        if anomaly is not None:
+            anomalies.append(anomaly)
+        
+        # Multivariate check catches unusual combinations of normal-looking features
+        if self.isolation_forest is not None:
+            # Encoder categories are looked up directly to skip per-call validation
+            content_type_code = self.content_type_codes.get(features.get('content_type', ''), -1)
+            vector = np.asarray([self._feature_vector(features) + [content_type_code]], dtype=np.float64)
+            score = float(-self.isolation_forest.score_samples(vector)[0])
+            
+            # Same decision as predict(), without scoring the vector twice
+            if score > -self.isolation_forest.offset_:
+                anomalies.append(Anomaly(MULTIVARIATE_FEATURE, features, score))
         
         return anomalies
     
     def _extract_features(self, response: Dict) -> Dict:
         """Extract features from HTTP response for ML analysis."""
-        features = {}
-        
-        # Response time feature
-        if 'response_time' in response:
-            features['response_time'] = response['response_time']
-        
-        # Response size feature
-        if 'content' in response:
-            features['response_size'] = len(str(response['content']))
-        
-        # Status code feature
-        if 'status_code' in response:
-            features['status_code'] = response['status_code']
-        
-        # Header count feature
-        if 'headers' in response:
-            features['header_count'] = len(response['headers'])
+        return _extract_features_static(response, self._content_features)
+    
+    def _content_features(self, content: str) -> Tuple[float, int]:
+        """
+        Compute (entropy, error_pattern) for a response body, reusing cached results.
         
-        # Content-Type feature
-        if 'headers' in response and 'Content-Type' in response['headers']:
-            features['content_type'] = response['headers']['Content-Type']
+        Replayed and fuzzed responses often repeat the same body, so results are
+        memoized on (length, hash) of the string; str hashes are cached by Python.
+        """
+        key = (len(content), hash(content))
         
-        # Response entropy (randomness)
-        if 'content' in response:
-            features['content_entropy'] = self._calculate_entropy(str(response['content']))
+        with self._feature_cache_lock:
+            cached = self._feature_cache.get(key)
+            if cached is not None:
+                self._feature_cache.move_to_end(key)
+                return cached
         
-        # Error pattern detection
-        if 'content' in response:
-            features['error_pattern'] = self._detect_error_patterns(str(response['content']))
+        result = _scan_body(content)
         
-        # Redirect count
-        if 'redirect_count' in response:
-            features['redirect_count'] = response['redirect_count']
+        with self._feature_cache_lock:
+            self._feature_cache[key] = result
+            if len(self._feature_cache) > self.feature_cache_size:
+                self._feature_cache.popitem(last=False)
         
-        return features
+        return result
     
-    def _is_anomalous(self, feature_name: str, value, baseline_values: List) -> Tuple[bool, float]:
+    def _is_anomalous(self, feature_name: str, value) -> Tuple[bool, float]:
         """
-        Determine if a feature value is anomalous.
+        Determine if a categorical feature value is anomalous.
         
         Args:
             feature_name: Name of the feature
             value: Current value
-            baseline_values: Historical baseline values
             
         Returns:
             Tuple of (is_anomalous, anomaly_score)
         """
-        if len(baseline_values) < self.min_samples:
+        # Constant and under-sampled features carry no signal
+        if feature_name in self._const_features:
             return False, 0.0
         
-        # Numeric features
-        if isinstance(value, (int, float)):
-            return self._detect_numeric_anomaly(value, baseline_values)
-        
-        # Categorical features
-        elif isinstance(value, str):
-            return self._detect_categorical_anomaly(value, baseline_values)
+        if isinstance(value, str) and feature_name in self.cat_totals:
+            return self._detect_categorical_anomaly(feature_name, value)
         
         return False, 0.0
     
-    def _detect_numeric_anomaly(self, value: float, baseline: List[float]) -> Tuple[bool, float]:
-        """Detect anomalies in numeric features using statistical methods."""
-        import statistics
+    def _detect_hbos_anomaly(self, features: Dict) -> Optional[Anomaly]:
+        """
+        Score the numeric features of a response with HBOS.
         
-        try:
-            mean = statistics.mean(baseline)
-            stdev = statistics.stdev(baseline) if len(baseline) > 1 else 0
-            
-            if stdev == 0:
-                return False, 0.0
-            
-            # Z-score anomaly detection
-            z_score = abs((value - mean) / stdev)
+        Args:
+            features: Extracted response features
             
-            # Anomalous if Z-score > 3 (99.7% confidence)
-            is_anomalous = z_score > 3
-            anomaly_score = min(z_score / 10, 1.0)  # Normalize to 0-1
+        Returns:
+            Anomaly for the top contributing feature when the summed score
+            exceeds the learned threshold, otherwise None
+        """
+        total = 0.0
+        top_feature, top_score = None, 0.0
+        for feature_name, value in features.items():
+            if (feature_name not in self.histograms or feature_name in self._const_features
+                    or not isinstance(value, (int, float))):
+                continue
             
-            return is_anomalous, anomaly_score
+            score = float(self._hbos_scores(feature_name, np.asarray([value], dtype=np.float64))[0])
+            total += score
+            if score > top_score:
+                top_feature, top_score = feature_name, score
         
-        except Exception as e:
-            logger.debug(f"Error in numeric anomaly detection: {e}")
-            return False, 0.0
+        if top_feature is None or total <= self.hbos_threshold:
+            return None
+        
+        # 0 at the threshold, 0.5 at twice it, approaching 1 for extreme totals
+        return Anomaly(top_feature, features[top_feature], 1.0 - self.hbos_threshold / total)
     
-    def _detect_categorical_anomaly(self, value: str, baseline: List[str]) -> Tuple[bool, float]:
-        """Detect anomalies in categorical features using frequency analysis."""
-        # Count occurrences
-        value_counts = defaultdict(int)
-        for v in baseline:
-            value_counts[v] += 1
+    def _hbos_scores(self, feature_name: str, values: np.ndarray,
+                     bin_scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Look up HBOS bin scores for an array of values of one feature.
+        
+        Values up to one bin width outside the trained range score as the edge
+        bin; further out the log of the distance in bin widths is added, so
+        a value just past the range is not treated as maximally anomalous.
         
-        total_count = len(baseline)
-        value_frequency = value_counts.get(value, 0) / total_count
+        Args:
+            feature_name: Name of the feature
+            values: Feature values
+            bin_scores: Per-bin scores to use instead of the trained ones
+            
+        Returns:
+            Score for each value
+        """
+        edges, trained_scores = self.histograms[feature_name]
+        bin_scores = trained_scores if bin_scores is None else bin_scores
+        index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(bin_scores) - 1)
+        # Bin widths past the nearest edge; zero or negative inside the range
+        distance = np.maximum(edges[0] - values, values - edges[-1]) / (edges[1] - edges[0])
+        return bin_scores[index] + np.log(np.maximum(distance, 1.0))
+    
+    def _detect_categorical_anomaly(self, feature_name: str, value: str) -> Tuple[bool, float]:
+        """Detect anomalies in categorical features using frequency analysis."""
+        value_frequency = self.cat_counts[feature_name].get(value, 0) / self.cat_totals[feature_name]
         
         # Anomalous if frequency < 10%
         is_anomalous = value_frequency < 0.1
@@ -187,46 +490,47 @@ class MLAnomalyDetector:
         
         return is_anomalous, anomaly_score
     
-    def _calculate_entropy(self, content: str) -> float:
-        """Calculate Shannon entropy of content."""
-        if not content:
-            return 0.0
-        
-        import math
-        
-        # Count character frequencies
-        frequencies = defaultdict(int)
-        for char in content:
-            frequencies[char] += 1
-        
-        # Calculate entropy
-        entropy = 0.0
-        content_length = len(content)
-        
-        for count in frequencies.values():
-            probability = count / content_length
-            entropy -= probability * math.log2(probability)
+    @staticmethod
+    def _scan_content(data: bytes) -> Tuple[float, int]:
+        """
+        Compute (entropy, error_pattern) for raw body bytes in one fused scan.
         
-        return entropy
+        The byte histogram built for entropy doubles as a prefilter for the
+        keyword search: keywords needing a byte absent from the body are never
+        searched, and bodies that rule out every keyword skip the lowercase copy.
+        """
+        if not data:
+            return 0.0, 0
+        
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        probabilities = counts[counts > 0] / len(data)
+        entropy = float(-(probabilities * np.log2(probabilities)).sum())
+        
+        # Fold A-Z into a-z so the histogram matches lowercased content
+        present = counts > 0
+        present[97:123] |= present[65:91]
+        possible = ~(_ERROR_KEYWORD_BYTES_MASK & ~present).any(axis=1)
+        if not possible.any():
+            return entropy, 0
+        
+        data_lower = data.lower()
+        error_count = sum(
+            1 for keyword, candidate in zip(_ERROR_KEYWORDS_BYTES, possible)
+            if candidate and keyword in data_lower
+        )
+        
+        return entropy, error_count
     
-    def _detect_error_patterns(self, content: str) -> int:
-        """Detect error patterns in content."""
-        error_keywords = [
-            'exception', 'error', 'warning', 'fatal', 'stack trace',
-            'sql error', 'syntax error', 'undefined', 'null pointer',
-            'access denied', 'forbidden', 'unauthorized'
-        ]
-        
-        error_count = 0
-        content_lower = content.lower()
-        
-        for keyword in error_keywords:
-            if keyword in content_lower:
-                error_count += 1
-        
-        return error_count
+    @staticmethod
+    def _content_size(response: Dict) -> int:
+        """Return the length of response content as a string, preferring a precomputed '_size'."""
+        if response.get('_size'):
+            return response['_size']
+        content = response.get('content', '')
+        return len(content) if isinstance(content, str) else len(str(content))
     
-    def _calculate_severity(self, anomaly_score: float) -> str:
+    @staticmethod
+    def _calculate_severity(anomaly_score: float) -> str:
         """Calculate severity based on anomaly score."""
         if anomaly_score >= 0.8:
             return 'high'
@@ -257,30 +561,27 @@ class MLAnomalyDetector:
         if not responses:
             return patterns
         
-        total_time = 0
-        total_size = 0
-        error_count = 0
-        
-        for response in responses:
-            # Status codes
-            if 'status_code' in response:
-                patterns['unique_status_codes'].add(response['status_code'])
-                if response['status_code'] >= 400:
-                    error_count += 1
-            
-            # Response time
-            if 'response_time' in response:
-                total_time += response['response_time']
-            
-            # Response size
-            if 'content' in response:
-                total_size += len(str(response['content']))
+        count = len(responses)
+        
+        # Flatten response fields into columns (missing values count as 0)
+        status_codes = np.fromiter(
+            (response.get('status_code', 0) for response in responses),
+            dtype=np.int32, count=count
+        )
+        times = np.fromiter(
+            (response.get('response_time', 0.0) for response in responses),
+            dtype=np.float64, count=count
+        )
+        sizes = np.fromiter(
+            (self._content_size(response) for response in responses),
+            dtype=np.int64, count=count
+        )
         
         # Calculate averages
-        patterns['avg_response_time'] = total_time / len(responses)
-        patterns['avg_response_size'] = total_size / len(responses)
-        patterns['error_rate'] = (error_count / len(responses)) * 100
-        patterns['unique_status_codes'] = list(patterns['unique_status_codes'])
+        patterns['avg_response_time'] = float(times.mean())
+        patterns['avg_response_size'] = float(sizes.mean())
+        patterns['error_rate'] = float((status_codes >= 400).mean() * 100)
+        patterns['unique_status_codes'] = np.unique(status_codes[status_codes > 0]).tolist()
         
         return patterns
     
@@ -302,13 +603,17 @@ class MLAnomalyDetector:
         # Group by similar inputs
         timing_groups = defaultdict(list)
         for input_data, response_time in timing_data:
-            # Hash input to group similar requests
-            input_hash = hashlib.md5(str(input_data).encode()).hexdigest()[:8]
-            timing_groups[input_hash].append(response_time)
+            # Group identical inputs. Key on the value itself rather than its
+            # hash so colliding inputs stay apart; the type keeps 1, 1.0 and
+            # True apart too. Unhashable inputs fall back to their str()
+            input_key = (type(input_data), input_data)
+            try:
+                hash(input_key)
+            except TypeError:
+                input_key = (type(input_data), str(input_data))
+            timing_groups[input_key].append(response_time)
         
         # Check for significant timing differences
-        import statistics
-        
         for group_id, times in timing_groups.items():
             if len(times) > 1:
                 mean_time = statistics.mean(times)
@@ -383,3 +688,50 @@ class MLAnomalyDetector:
                         })
         
         return predictions
+
+
+def _scan_body(content: str) -> Tuple[float, int]:
+    """Compute (entropy, error_pattern) over a single UTF-8 encoding of the body."""
+    return MLAnomalyDetector._scan_content(content.encode('utf-8', 'ignore'))
+
+
+def _extract_features_static(response: Dict, content_features=None) -> Dict:
+    """
+    Extract features from HTTP response for ML analysis.
+    
+    Module-level so it can be shipped to worker processes; content_features
+    defaults to an uncached body scan. When the caller already knows the body
+    length (``response['_size']``, the length of ``str(content)``, as set by
+    HTTPClient.summarize_response) it is used instead of measuring again.
+    """
+    content_features = content_features or _scan_body
+    features = {}
+    
+    # Response time feature
+    if 'response_time' in response:
+        features['response_time'] = response['response_time']
+    
+    # Content features (size, entropy, error patterns) share one stringified body
+    if 'content' in response:
+        content = response['content']
+        content = content if isinstance(content, str) else str(content)
+        features['response_size'] = response.get('_size') or len(content)
+        features['content_entropy'], features['error_pattern'] = content_features(content)
+    
+    # Status code feature
+    if 'status_code' in response:
+        features['status_code'] = response['status_code']
+    
+    # Header count feature
+    if 'headers' in response:
+        features['header_count'] = len(response['headers'])
+    
+    # Content-Type feature
+    if 'headers' in response and 'Content-Type' in response['headers']:
+        features['content_type'] = response['headers']['Content-Type']
+    
+    # Redirect count
+    if 'redirect_count' in response:
+        features['redirect_count'] = response['redirect_count']
+    
+    return features
@@ -159,7 +159,7 @@ class EnhancedOSINT:
             response = self.http_client.get(api_url)
             
             if response and response.status_code == 200:
-                data = response.json()
+                data = self.http_client.parse_json(response)
                 if 'archived_snapshots' in data:
                     archives['snapshots_available'] = True
                     archives['historical_data'] = data.get('archived_snapshots', {})
@@ -233,7 +233,7 @@ class EnhancedOSINT:
             response = self.http_client.get(crt_url)
             
             if response and response.status_code == 200:
-                cert_data = response.json()
+                cert_data = self.http_client.parse_json(response)
                 
                 for cert in cert_data:
                     name_value = cert.get('name_value', '')
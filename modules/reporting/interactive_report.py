@@ -3,62 +3,110 @@ Interactive HTML Report Generator
 Generates interactive, feature-rich HTML reports with charts and filtering
 """
 
+import hashlib
+import io
 import json
-from typing import Dict, List
+import os
+from collections import Counter, OrderedDict
+from functools import partial
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import quote
 from datetime import datetime
 from utils.logger import get_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+# Card markup is filled with %-formatting; missing fields fall back to _CARD_DEFAULTS
+_CARD_TMPL = '''
+            <div class="vuln-card %(severity)s" id="v%(index)d">
+                <div class="vuln-header">
+                    <div class="vuln-title">%(type)s</div>
+                    <div class="severity-badge %(severity)s">%(severity)s</div>
+                </div>
+                <div class="vuln-url"><strong>URL:</strong> %(url)s</div>
+                <div class="vuln-description">%(description)s</div>
+                <div class="vuln-evidence"><strong>Evidence:</strong><br>%(evidence)s</div>
+                <div class="vuln-remediation"><strong>Remediation:</strong><br>%(remediation)s</div>
+            </div>
+            '''
 
-class InteractiveReportGenerator:
-    """Generate interactive HTML reports with JavaScript functionality."""
-    
-    def __init__(self, config: Dict):
-        """Initialize interactive report generator."""
-        self.config = config
-    
-    def generate_interactive_report(self, scan_results: Dict, output_file: str) -> str:
-        """
-        Generate interactive HTML report.
-        
-        Args:
-            scan_results: Scan results dictionary
-            output_file: Output file path
-            
-        Returns:
-            Path to generated report
-        """
-        html_content = self._build_interactive_html(scan_results)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        logger.info(f"Interactive report generated: {output_file}")
-        return output_file
-    
-    def _build_interactive_html(self, results: Dict) -> str:
-        """Build interactive HTML report."""
-        vulnerabilities = results.get('vulnerabilities', [])
-        target = results.get('target', 'Unknown')
-        scan_time = results.get('scan_time', datetime.now().isoformat())
-        
-        # Prepare data for JavaScript
-        vuln_data_json = json.dumps(vulnerabilities)
-        severity_stats = self._calculate_severity_stats(vulnerabilities)
-        type_stats = self._calculate_type_stats(vulnerabilities)
-        
-        html = f'''<!DOCTYPE html>
+_CARD_DEFAULTS = {
+    'severity': 'info',
+    'type': 'Unknown',
+    'url': 'N/A',
+    'description': 'No description available',
+    'evidence': 'No evidence available',
+    'remediation': 'No remediation available'
+}
+
+_SEV_ORDER = ('critical', 'high', 'medium', 'low', 'info')
+
+# Findings equal in these fields (typically the same issue on many URLs)
+# share one card that lists every affected URL
+_GROUP_FIELDS = ('type', 'description', 'remediation', 'severity')
+
+_URL_LIST_TMPL = '<details><summary>%d affected URLs</summary>%s</details>'
+
+# Cards show at most this many characters of a field; the embedded JSON
+# (and therefore the JSON/CSV exports) keeps the full text
+_EVIDENCE_LIMIT = 2048
+_DESCRIPTION_LIMIT = 8192
+_TRUNCATED_MARK = '… [truncated]'
+
+_HTML_TT = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;'
+})
+
+
+def _truncate(value, limit: int) -> str:
+    """Shorten a card field to limit characters, marking the cut."""
+    text = str(value)
+    return text if len(text) <= limit else text[:limit] + _TRUNCATED_MARK
+
+
+def _escape_html(value) -> str:
+    """Escape a value for HTML text or attribute context in a single pass."""
+    return str(value).translate(_HTML_TT)
+
+
+_compact_dumps = partial(json.dumps, separators=(',', ':'), ensure_ascii=False)
+
+
+def _dumps_js(value) -> bytes:
+    """Serialize a value to compact UTF-8 JSON that is safe inside a <script> block."""
+    if orjson is not None:
+        data = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        data = _compact_dumps(value).encode('utf-8')
+    # Keep '</script>' in scanned content from closing the script element
+    return data.replace(b'</', b'<\\/')
+
+
+# Page fragments. Constants without a _TMPL suffix are written verbatim; the
+# *_TMPL strings are %-formatted with the handful of per-report values. All
+# of them are encoded to UTF-8 once, below, and written to a binary handle.
+_HEAD_TMPL = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Deep Eye Security Report - {target}</title>
+    <title>Deep Eye Security Report - %s</title>
     <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+'''
+
+_CSS = '''        * { margin: 0; padding: 0; box-sizing: border-box; }
         
-        :root {{
+        :root {
             --bg-gradient-start: #667eea;
             --bg-gradient-end: #764ba2;
             --container-bg: #ffffff;
@@ -70,9 +118,9 @@ class InteractiveReportGenerator:
             --shadow-hover: 0 5px 20px rgba(0,0,0,0.15);
             --header-bg: #2c3e50;
             --accent-color: #3498db;
-        }}
+        }
         
-        [data-theme="dark"] {{
+        [data-theme="dark"] {
             --bg-gradient-start: #1a1a1a;
             --bg-gradient-end: #2d2d2d;
             --container-bg: #1e1e1e;
@@ -83,26 +131,26 @@ class InteractiveReportGenerator:
             --shadow: 0 2px 10px rgba(0,0,0,0.3);
             --shadow-hover: 0 5px 20px rgba(0,0,0,0.4);
             --header-bg: #1a1a1a;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, var(--bg-gradient-start) 0%, var(--bg-gradient-end) 100%);
             padding: 20px;
             color: var(--text-primary);
             transition: all 0.3s ease;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: var(--container-bg);
             border-radius: 15px;
             box-shadow: var(--shadow-hover);
             overflow: hidden;
-        }}
+        }
         
-        .controls-bar {{
+        .controls-bar {
             position: fixed;
             top: 20px;
             right: 20px;
@@ -110,9 +158,9 @@ class InteractiveReportGenerator:
             display: flex;
             gap: 10px;
             flex-wrap: wrap;
-        }}
+        }
         
-        .control-btn {{
+        .control-btn {
             background: var(--accent-color);
             color: white;
             border: none;
@@ -123,39 +171,39 @@ class InteractiveReportGenerator:
             font-weight: bold;
             box-shadow: var(--shadow);
             transition: all 0.3s ease;
-        }}
+        }
         
-        .control-btn:hover {{
+        .control-btn:hover {
             transform: translateY(-2px);
             box-shadow: var(--shadow-hover);
-        }}
+        }
         
-        .header {{
+        .header {
             background: var(--header-bg);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             font-size: 1.1em;
             opacity: 0.9;
-        }}
+        }
         
-        .stats-container {{
+        .stats-container {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             padding: 30px;
             background: var(--container-bg);
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: var(--card-bg);
             padding: 25px;
             border-radius: 12px;
@@ -163,49 +211,49 @@ class InteractiveReportGenerator:
             text-align: center;
             transition: all 0.3s ease;
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-5px);
             box-shadow: var(--shadow-hover);
-        }}
+        }
         
-        .stat-card .number {{
+        .stat-card .number {
             font-size: 3em;
             font-weight: bold;
             margin-bottom: 10px;
-        }}
+        }
         
-        .stat-card .label {{
+        .stat-card .label {
             color: var(--text-secondary);
             font-size: 1.1em;
-        }}
+        }
         
-        .critical {{ color: #e74c3c; }}
-        .high {{ color: #e67e22; }}
-        .medium {{ color: #f39c12; }}
-        .low {{ color: #3498db; }}
-        .info {{ color: #95a5a6; }}
+        .critical { color: #e74c3c; }
+        .high { color: #e67e22; }
+        .medium { color: #f39c12; }
+        .low { color: #3498db; }
+        .info { color: #95a5a6; }
         
-        .controls {{
+        .controls {
             padding: 30px;
             background: var(--container-bg);
             border-bottom: 2px solid var(--border-color);
-        }}
+        }
         
-        .controls h2 {{
+        .controls h2 {
             margin-bottom: 20px;
             color: var(--text-primary);
-        }}
+        }
         
-        .filter-group {{
+        .filter-group {
             display: flex;
             gap: 15px;
             flex-wrap: wrap;
             margin-bottom: 20px;
-        }}
+        }
         
-        .filter-btn {{
+        .filter-btn {
             padding: 10px 20px;
             border: 2px solid var(--accent-color);
             background: var(--container-bg);
@@ -215,19 +263,19 @@ class InteractiveReportGenerator:
             transition: all 0.3s ease;
             font-size: 1em;
             font-weight: 500;
-        }}
+        }
         
-        .filter-btn:hover {{
+        .filter-btn:hover {
             background: var(--accent-color);
             color: white;
-        }}
+        }
         
-        .filter-btn.active {{
+        .filter-btn.active {
             background: var(--accent-color);
             color: white;
-        }}
+        }
         
-        .search-box {{
+        .search-box {
             width: 100%;
             padding: 15px;
             border: 2px solid var(--border-color);
@@ -235,36 +283,36 @@ class InteractiveReportGenerator:
             font-size: 1em;
             background: var(--card-bg);
             color: var(--text-primary);
-        }}
+        }
         
-        .charts-container {{
+        .charts-container {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
             gap: 30px;
             padding: 30px;
             background: var(--container-bg);
-        }}
+        }
         
-        .chart-card {{
+        .chart-card {
             background: var(--card-bg);
             padding: 25px;
             border-radius: 12px;
             box-shadow: var(--shadow);
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .chart-card h3 {{
+        .chart-card h3 {
             margin-bottom: 20px;
             color: var(--text-primary);
             text-align: center;
-        }}
+        }
         
-        .vulnerabilities {{
+        .vulnerabilities {
             padding: 30px;
             background: var(--container-bg);
-        }}
+        }
         
-        .vuln-card {{
+        .vuln-card {
             background: var(--card-bg);
             border-left: 5px solid;
             padding: 25px;
@@ -272,63 +320,63 @@ class InteractiveReportGenerator:
             border-radius: 10px;
             box-shadow: var(--shadow);
             transition: all 0.3s ease;
-        }}
+        }
         
-        .vuln-card:hover {{
+        .vuln-card:hover {
             box-shadow: var(--shadow-hover);
             transform: translateX(5px);
-        }}
+        }
         
-        .vuln-card.critical {{ border-left-color: #e74c3c; }}
-        .vuln-card.high {{ border-left-color: #e67e22; }}
-        .vuln-card.medium {{ border-left-color: #f39c12; }}
-        .vuln-card.low {{ border-left-color: #3498db; }}
-        .vuln-card.info {{ border-left-color: #95a5a6; }}
+        .vuln-card.critical { border-left-color: #e74c3c; }
+        .vuln-card.high { border-left-color: #e67e22; }
+        .vuln-card.medium { border-left-color: #f39c12; }
+        .vuln-card.low { border-left-color: #3498db; }
+        .vuln-card.info { border-left-color: #95a5a6; }
         
-        .vuln-header {{
+        .vuln-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 15px;
             flex-wrap: wrap;
             gap: 10px;
-        }}
+        }
         
-        .vuln-title {{
+        .vuln-title {
             font-size: 1.3em;
             font-weight: bold;
             color: var(--text-primary);
-        }}
+        }
         
-        .severity-badge {{
+        .severity-badge {
             padding: 8px 16px;
             border-radius: 20px;
             color: white;
             font-weight: bold;
             text-transform: uppercase;
             font-size: 0.85em;
-        }}
+        }
         
-        .severity-badge.critical {{ background: #e74c3c; }}
-        .severity-badge.high {{ background: #e67e22; }}
-        .severity-badge.medium {{ background: #f39c12; }}
-        .severity-badge.low {{ background: #3498db; }}
-        .severity-badge.info {{ background: #95a5a6; }}
+        .severity-badge.critical { background: #e74c3c; }
+        .severity-badge.high { background: #e67e22; }
+        .severity-badge.medium { background: #f39c12; }
+        .severity-badge.low { background: #3498db; }
+        .severity-badge.info { background: #95a5a6; }
         
-        .vuln-url {{
+        .vuln-url {
             color: var(--text-secondary);
             font-size: 0.95em;
             margin-bottom: 10px;
             word-break: break-all;
-        }}
+        }
         
-        .vuln-description {{
+        .vuln-description {
             margin-bottom: 15px;
             line-height: 1.6;
             color: var(--text-primary);
-        }}
+        }
         
-        .vuln-evidence {{
+        .vuln-evidence {
             background: var(--card-bg);
             padding: 15px;
             border-radius: 8px;
@@ -339,87 +387,89 @@ class InteractiveReportGenerator:
             word-break: break-all;
             border: 1px solid var(--border-color);
             color: var(--text-primary);
-        }}
+        }
         
-        .vuln-remediation {{
+        .vuln-remediation {
             background: #e8f5e9;
             padding: 15px;
             border-radius: 8px;
             border-left: 4px solid #4caf50;
-        }}
+        }
         
-        .vuln-remediation strong {{
+        .vuln-remediation strong {
             color: #2e7d32;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: var(--header-bg);
             color: white;
             text-align: center;
             padding: 25px;
-        }}
+        }
         
-        .hidden {{
+        .hidden {
             display: none !important;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            body {{
+        @media (max-width: 768px) {
+            body {
                 padding: 10px;
-            }}
+            }
             
-            .controls-bar {{
+            .controls-bar {
                 position: static;
                 justify-content: center;
                 margin-bottom: 20px;
-            }}
+            }
             
-            .header h1 {{
+            .header h1 {
                 font-size: 2em;
-            }}
+            }
             
-            .stats-container {{
+            .stats-container {
                 grid-template-columns: repeat(2, 1fr);
                 gap: 15px;
                 padding: 20px;
-            }}
+            }
             
-            .charts-container {{
+            .charts-container {
                 grid-template-columns: 1fr;
                 padding: 20px;
-            }}
+            }
             
-            .filter-group {{
+            .filter-group {
                 flex-direction: column;
-            }}
+            }
             
-            .filter-btn {{
+            .filter-btn {
                 width: 100%;
-            }}
-        }}
+            }
+        }
         
-        @media print {{
-            .controls-bar, .controls, .charts-container {{
+        @media print {
+            .controls-bar, .controls, .charts-container {
                 display: none !important;
-            }}
+            }
             
-            body {{
+            body {
                 background: white;
                 color: black;
                 padding: 0;
-            }}
+            }
             
-            .container {{
+            .container {
                 box-shadow: none;
-            }}
+            }
             
-            .vuln-card {{
+            .vuln-card {
                 page-break-inside: avoid;
-            }}
-        }}
-    </style>
+            }
+        }
+'''
+
+_BODY_TMPL = '''    </style>
 </head>
-<body>
+<body data-target="%s" data-scan="%s">
     <div class="controls-bar">
         <button class="control-btn" onclick="toggleTheme()">🌙 Dark Mode</button>
         <button class="control-btn" onclick="exportToJSON()">📥 Export JSON</button>
@@ -431,35 +481,27 @@ class InteractiveReportGenerator:
         <div class="header">
             <h1>🔍 Deep Eye Security Report</h1>
             <div class="subtitle">
-                Target: {target}<br>
-                Scan Date: {scan_time}
+                Target: %s<br>
+                Scan Date: %s
             </div>
         </div>
-        
+'''
+
+_STATS_OPEN = '''        
         <div class="stats-container">
-            <div class="stat-card">
-                <div class="number critical">{severity_stats.get('critical', 0)}</div>
-                <div class="label">Critical</div>
-            </div>
-            <div class="stat-card">
-                <div class="number high">{severity_stats.get('high', 0)}</div>
-                <div class="label">High</div>
-            </div>
-            <div class="stat-card">
-                <div class="number medium">{severity_stats.get('medium', 0)}</div>
-                <div class="label">Medium</div>
-            </div>
-            <div class="stat-card">
-                <div class="number low">{severity_stats.get('low', 0)}</div>
-                <div class="label">Low</div>
-            </div>
-            <div class="stat-card">
-                <div class="number info">{severity_stats.get('info', 0)}</div>
-                <div class="label">Info</div>
+'''
+
+_STAT_CARD_TMPL = '''            <div class="stat-card">
+                <div class="number %s">%d</div>
+                <div class="label">%s</div>
             </div>
-        </div>
+'''
+
+_STATS_CLOSE = '''        </div>
         
-        <div class="controls">
+'''
+
+_CONTROLS = '''        <div class="controls">
             <h2>Filters & Search</h2>
             <div class="filter-group">
                 <button class="filter-btn active" onclick="filterBySeverity('all')">All</button>
@@ -483,21 +525,37 @@ class InteractiveReportGenerator:
             </div>
         </div>
         
-        <div class="vulnerabilities" id="vulnerabilitiesContainer">
-            {self._generate_vulnerability_cards(vulnerabilities)}
-        </div>
-        
-        <div class="footer">
+'''
+
+_FOOTER = '''        <div class="footer">
             <p>Generated by Deep Eye v1.1.0 | &copy; 2025 | For authorized testing only</p>
         </div>
     </div>
     
-    <script>
-        const vulnerabilities = {vuln_data_json};
+'''
+
+# Large reports load the vulnerability list from a sidecar script that
+# assigns it to this global instead of inlining it in the page
+_SIDECAR_GLOBAL = b'window.deepEyeVulnerabilities'
+
+_SIDECAR_SCRIPT_TMPL = '''    <script src="%s"></script>
+'''
+
+_SCRIPT_DATA_TMPL = '''    <script>
+        const vulnerabilities = %s;
+        const reportTarget = document.body.dataset.target;
+        const reportScanTime = document.body.dataset.scan;
+        const severityData = %s;
+        const typeData = %s;
+        const cardGroups = %s;
+        const lazyCards = %s;
+        const cardLimits = %s;'''
+
+_JS_SCAFFOLD = '''
         let currentFilter = 'all';
         
         // Dark Mode Toggle
-        function toggleTheme() {{
+        function toggleTheme() {
             const html = document.documentElement;
             const currentTheme = html.getAttribute('data-theme');
             const newTheme = currentTheme === 'dark' ? '' : 'dark';
@@ -506,220 +564,468 @@ class InteractiveReportGenerator:
             
             const btn = document.querySelector('.controls-bar .control-btn');
             btn.textContent = newTheme === 'dark' ? '☀️ Light Mode' : '🌙 Dark Mode';
-        }}
+        }
         
         // Load saved theme
-        document.addEventListener('DOMContentLoaded', function() {{
+        document.addEventListener('DOMContentLoaded', function() {
             const savedTheme = localStorage.getItem('theme');
-            if (savedTheme === 'dark') {{
+            if (savedTheme === 'dark') {
                 document.documentElement.setAttribute('data-theme', 'dark');
                 const themeBtn = document.querySelector('.controls-bar .control-btn');
                 if (themeBtn) themeBtn.textContent = '☀️ Light Mode';
-            }}
-        }});
+            }
+        });
         
         // Export to JSON
-        function exportToJSON() {{
-            const dataStr = JSON.stringify({{
-                target: '{target}',
-                scan_date: '{scan_time}',
+        function exportToJSON() {
+            const dataStr = JSON.stringify({
+                target: reportTarget,
+                scan_date: reportScanTime,
                 vulnerabilities: vulnerabilities
-            }}, null, 2);
+            }, null, 2);
             
-            const blob = new Blob([dataStr], {{type: 'application/json'}});
+            const blob = new Blob([dataStr], {type: 'application/json'});
             const url = URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
-            a.download = 'deep-eye-report-{target}.json';
+            a.download = 'deep-eye-report-' + reportTarget + '.json';
             a.click();
             URL.revokeObjectURL(url);
-        }}
+        }
         
         // Export to CSV
-        function exportToCSV() {{
-            let csv = 'Severity,Type,URL,Description,Evidence,Remediation\\n';
-            vulnerabilities.forEach(vuln => {{
-                const severity = vuln.severity || '';
-                const type = (vuln.type || '').replace(/"/g, '""');
-                const url = (vuln.url || '').replace(/"/g, '""');
-                const desc = (vuln.description || '').replace(/"/g, '""');
-                const evidence = (vuln.evidence || '').replace(/"/g, '""');
-                const remediation = (vuln.remediation || '').replace(/"/g, '""');
-                csv += `"${{severity}}","${{type}}","${{url}}","${{desc}}","${{evidence}}","${{remediation}}"\\n`;
-            }});
+        function exportToCSV() {
+            const q = value => '"' + String(value || '').split('"').join('""') + '"';
+            const rows = vulnerabilities.map(vuln => [
+                q(vuln.severity), q(vuln.type), q(vuln.url),
+                q(vuln.description), q(vuln.evidence), q(vuln.remediation)
+            ].join(','));
+            rows.unshift('Severity,Type,URL,Description,Evidence,Remediation');
+            const csv = rows.join('\\n') + '\\n';
             
-            const blob = new Blob([csv], {{type: 'text/csv'}});
+            const blob = new Blob([csv], {type: 'text/csv'});
             const url = URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
-            a.download = 'deep-eye-report-{target}.csv';
+            a.download = 'deep-eye-report-' + reportTarget + '.csv';
             a.click();
             URL.revokeObjectURL(url);
-        }}
+        }
         
         // Initialize charts
         const severityCtx = document.getElementById('severityChart').getContext('2d');
-        const severityChart = new Chart(severityCtx, {{
+        const severityChart = new Chart(severityCtx, {
             type: 'doughnut',
-            data: {{
+            data: {
                 labels: ['Critical', 'High', 'Medium', 'Low', 'Info'],
-                datasets: [{{
-                    data: [{severity_stats.get('critical', 0)}, {severity_stats.get('high', 0)}, {severity_stats.get('medium', 0)}, {severity_stats.get('low', 0)}, {severity_stats.get('info', 0)}],
+                datasets: [{
+                    data: severityData,
                     backgroundColor: ['#e74c3c', '#e67e22', '#f39c12', '#3498db', '#95a5a6'],
                     borderWidth: 2,
                     borderColor: '#ffffff'
-                }}]
-            }},
-            options: {{
+                }]
+            },
+            options: {
                 responsive: true,
                 maintainAspectRatio: true,
-                plugins: {{
-                    legend: {{
+                plugins: {
+                    legend: {
                         position: 'bottom',
-                        labels: {{
+                        labels: {
                             padding: 15,
-                            font: {{
+                            font: {
                                 size: 12
-                            }}
-                        }}
-                    }},
-                    tooltip: {{
-                        callbacks: {{
-                            label: function(context) {{
+                            }
+                        }
+                    },
+                    tooltip: {
+                        callbacks: {
+                            label: function(context) {
                                 const label = context.label || '';
                                 const value = context.parsed || 0;
                                 const total = context.dataset.data.reduce((a, b) => a + b, 0);
                                 const percentage = total > 0 ? ((value / total) * 100).toFixed(1) : 0;
                                 return label + ': ' + value + ' (' + percentage + '%)';
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
+                            }
+                        }
+                    }
+                }
+            }
+        });
         
         const typeCtx = document.getElementById('typeChart').getContext('2d');
-        const typeData = {json.dumps(type_stats)};
-        const typeChart = new Chart(typeCtx, {{
+        const typeChart = new Chart(typeCtx, {
             type: 'bar',
-            data: {{
+            data: {
                 labels: Object.keys(typeData),
-                datasets: [{{
+                datasets: [{
                     label: 'Vulnerability Count',
                     data: Object.values(typeData),
                     backgroundColor: '#3498db',
                     borderWidth: 0
-                }}]
-            }},
-            options: {{
+                }]
+            },
+            options: {
                 responsive: true,
                 maintainAspectRatio: true,
-                plugins: {{
-                    legend: {{
+                plugins: {
+                    legend: {
                         display: false
-                    }}
-                }},
-                scales: {{
-                    y: {{
+                    }
+                },
+                scales: {
+                    y: {
                         beginAtZero: true,
-                        ticks: {{
+                        ticks: {
                             stepSize: 1
-                        }}
-                    }}
-                }}
-            }}
-        }});
-        
-        function filterBySeverity(severity) {{
+                        }
+                    }
+                }
+            }
+        });
+        
+        // Card elements and lowercased search text, built once per page load.
+        // cardGroups[g] lists the findings shown on card g.
+        const cardElements = cardGroups.map((_, g) => document.getElementById('v' + g));
+        const searchIndex = vulnerabilities.map(vuln => [
+            vuln.severity, vuln.type, vuln.url, vuln.description, vuln.evidence, vuln.remediation
+        ].join(' ').toLowerCase());
+        let pendingSearch = 0;
+        
+        // Lazy mode: cards are rendered here in batches as the sentinel
+        // below the list scrolls into view, instead of being in the page
+        const CARD_BATCH = 50;
+        const cardDefaults = {
+            severity: 'info',
+            type: 'Unknown',
+            url: 'N/A',
+            description: 'No description available',
+            evidence: 'No evidence available',
+            remediation: 'No remediation available'
+        };
+        const htmlEscapes = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+        let visibleIndices = cardGroups.map((_, g) => g);
+        let renderedCount = 0;
+        
+        function cardField(vuln, key) {
+            let text = String(key in vuln ? vuln[key] : cardDefaults[key]);
+            const limit = cardLimits[key];
+            if (limit && text.length > limit) {
+                text = text.slice(0, limit) + '… [truncated]';
+            }
+            return text.replace(/[&<>"']/g, c => htmlEscapes[c]);
+        }
+        
+        function renderCard(g) {
+            const members = cardGroups[g];
+            const vuln = vulnerabilities[members[0]];
+            const severity = cardField(vuln, 'severity');
+            const urls = members.length === 1 ? cardField(vuln, 'url') :
+                `<details><summary>${members.length} affected URLs</summary>` +
+                members.map(i => cardField(vulnerabilities[i], 'url')).join('<br>') + '</details>';
+            return `
+            <div class="vuln-card ${severity}" id="v${g}">
+                <div class="vuln-header">
+                    <div class="vuln-title">${cardField(vuln, 'type')}</div>
+                    <div class="severity-badge ${severity}">${severity}</div>
+                </div>
+                <div class="vuln-url"><strong>URL:</strong> ${urls}</div>
+                <div class="vuln-description">${cardField(vuln, 'description')}</div>
+                <div class="vuln-evidence"><strong>Evidence:</strong><br>${cardField(vuln, 'evidence')}</div>
+                <div class="vuln-remediation"><strong>Remediation:</strong><br>${cardField(vuln, 'remediation')}</div>
+            </div>
+            `;
+        }
+        
+        function renderMoreCards() {
+            const batch = visibleIndices.slice(renderedCount, renderedCount + CARD_BATCH);
+            document.getElementById('vulnerabilitiesContainer')
+                .insertAdjacentHTML('beforeend', batch.map(renderCard).join(''));
+            renderedCount += batch.length;
+        }
+        
+        if (lazyCards) {
+            renderMoreCards();
+            new IntersectionObserver(entries => {
+                if (entries[0].isIntersecting && renderedCount < visibleIndices.length) {
+                    renderMoreCards();
+                }
+            }, {rootMargin: '400px'}).observe(document.getElementById('cardSentinel'));
+        }
+        
+        function applyFilters() {
+            const searchTerm = document.getElementById('searchBox').value.toLowerCase();
+            const matches = vulnerabilities.map((vuln, i) => {
+                const severityMatch = currentFilter === 'all' || (vuln.severity || 'info') === currentFilter;
+                return severityMatch && (!searchTerm || searchIndex[i].includes(searchTerm));
+            });
+            
+            const visible = cardGroups.map(members => members.some(i => matches[i]));
+            
+            if (lazyCards) {
+                visibleIndices = visible.reduce((acc, shown, g) => (shown && acc.push(g), acc), []);
+                document.getElementById('vulnerabilitiesContainer').innerHTML = '';
+                renderedCount = 0;
+                renderMoreCards();
+            } else {
+                cardElements.forEach((card, g) => card.classList.toggle('hidden', !visible[g]));
+            }
+        }
+        
+        function filterBySeverity(severity) {
             currentFilter = severity;
-            const cards = document.querySelectorAll('.vuln-card');
             const buttons = document.querySelectorAll('.filter-btn');
             
             buttons.forEach(btn => btn.classList.remove('active'));
             event.target.classList.add('active');
             
-            cards.forEach(card => {{
-                if (severity === 'all' || card.classList.contains(severity)) {{
-                    card.classList.remove('hidden');
-                }} else {{
-                    card.classList.add('hidden');
-                }}
-            }});
-        }}
-        
-        function searchVulnerabilities() {{
-            const searchTerm = document.getElementById('searchBox').value.toLowerCase();
-            const cards = document.querySelectorAll('.vuln-card');
-            
-            cards.forEach(card => {{
-                const text = card.textContent.toLowerCase();
-                if (text.includes(searchTerm)) {{
-                    if (currentFilter === 'all' || card.classList.contains(currentFilter)) {{
-                        card.classList.remove('hidden');
-                    }}
-                }} else {{
-                    card.classList.add('hidden');
-                }}
-            }});
-        }}
+            applyFilters();
+        }
+        
+        function searchVulnerabilities() {
+            // Coalesce fast typing into at most one pass per frame
+            if (pendingSearch) return;
+            pendingSearch = requestAnimationFrame(() => {
+                pendingSearch = 0;
+                applyFilters();
+            });
+        }
     </script>
 </body>
 </html>'''
+
+(_HEAD_TMPL, _CSS, _BODY_TMPL, _STATS_OPEN, _STAT_CARD_TMPL, _STATS_CLOSE, _CONTROLS,
+ _FOOTER, _SIDECAR_SCRIPT_TMPL, _SCRIPT_DATA_TMPL, _JS_SCAFFOLD) = (
+    part.encode('utf-8') for part in (
+        _HEAD_TMPL, _CSS, _BODY_TMPL, _STATS_OPEN, _STAT_CARD_TMPL, _STATS_CLOSE, _CONTROLS,
+        _FOOTER, _SIDECAR_SCRIPT_TMPL, _SCRIPT_DATA_TMPL, _JS_SCAFFOLD
+    )
+)
+
+_SEV_CLASSES = tuple((severity.encode('ascii'), severity.capitalize().encode('ascii'))
+                     for severity in _SEV_ORDER)
+
+_CARD_LIMITS_JS = _dumps_js({'evidence': _EVIDENCE_LIMIT, 'description': _DESCRIPTION_LIMIT})
+
+_CARDS_OPEN = b'''        <div class="vulnerabilities" id="vulnerabilitiesContainer">
+            '''
+
+_CARDS_EMPTY = b'<div class="vuln-card info"><p>No vulnerabilities found!</p></div>'
+
+_CARDS_CLOSE = b'''
+        </div>
         
-        return html
-    
-    def _generate_vulnerability_cards(self, vulnerabilities: List[Dict]) -> str:
-        """Generate HTML cards for vulnerabilities."""
-        if not vulnerabilities:
-            return '<div class="vuln-card info"><p>No vulnerabilities found!</p></div>'
+'''
+
+_CARDS_SENTINEL = b'''        <div id="cardSentinel"></div>
         
-        cards_html = []
+'''
+
+
+class InteractiveReportGenerator:
+    """Generate interactive HTML reports with JavaScript functionality."""
+    
+    def __init__(self, config: Dict):
+        """Initialize interactive report generator."""
+        self.config = config
+        # Scan date shown when results carry none; taken once rather than per report
+        self._default_time = datetime.now().isoformat()
+        report_config = config.get('reporting', {})
+        # Above this many findings the JSON payload goes to a sidecar file
+        self.sidecar_threshold = report_config.get('interactive_sidecar_threshold', 500)
+        # Above this many findings cards are rendered in the browser on scroll
+        self.lazy_threshold = report_config.get('interactive_lazy_threshold', 1000)
+        # Rendered pages keyed by a fingerprint of their input. Off by default:
+        # a cached page has to be built whole in memory instead of streamed
+        self.cache_size = report_config.get('interactive_cache_size', 0)
+        self._html_cache = OrderedDict()
+    
+    def generate_interactive_report(self, scan_results: Dict, output_file: str) -> str:
+        """
+        Generate interactive HTML report.
         
-        for vuln in vulnerabilities:
-            severity = vuln.get('severity', 'info')
-            vuln_type = vuln.get('type', 'Unknown')
-            url = vuln.get('url', 'N/A')
-            description = vuln.get('description', 'No description available')
-            evidence = vuln.get('evidence', 'No evidence available')
-            remediation = vuln.get('remediation', 'No remediation available')
+        Args:
+            scan_results: Scan results dictionary
+            output_file: Output file path
             
-            card = f'''
-            <div class="vuln-card {severity}">
-                <div class="vuln-header">
-                    <div class="vuln-title">{vuln_type}</div>
-                    <div class="severity-badge {severity}">{severity}</div>
-                </div>
-                <div class="vuln-url"><strong>URL:</strong> {url}</div>
-                <div class="vuln-description">{description}</div>
-                <div class="vuln-evidence"><strong>Evidence:</strong><br>{evidence}</div>
-                <div class="vuln-remediation"><strong>Remediation:</strong><br>{remediation}</div>
-            </div>
-            '''
-            cards_html.append(card)
+        Returns:
+            Path to generated report
+        """
+        sidecar_src = None
+        vulnerabilities = scan_results.get('vulnerabilities', [])
+        if len(vulnerabilities) > self.sidecar_threshold:
+            sidecar_file = output_file + '.vulns.js'
+            with open(sidecar_file, 'wb') as f:
+                f.write(b'%s = %s;\n' % (_SIDECAR_GLOBAL, _dumps_js(vulnerabilities)))
+            sidecar_src = os.path.basename(sidecar_file)
+        
+        # Fragments are already UTF-8, so skip the text layer entirely
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            if self.cache_size and sidecar_src is None:
+                f.write(self._build_report_bytes(scan_results, sidecar_src))
+            else:
+                # Stream each section straight to disk instead of building
+                # the whole document in memory first; reports big enough to
+                # need a sidecar are never worth keeping in the cache
+                self._write_report(f, scan_results, sidecar_src)
         
-        return ''.join(cards_html)
+        logger.info(f"Interactive report generated: {output_file}")
+        return output_file
+    
+    def _build_interactive_html(self, results: Dict) -> str:
+        """Build interactive HTML report."""
+        return self._build_report_bytes(results).decode('utf-8')
+    
+    def _build_report_bytes(self, results: Dict, sidecar_src: Optional[str] = None) -> bytes:
+        """Build the UTF-8 encoded report, reusing a cached page for identical input."""
+        key = self._fingerprint(results, sidecar_src) if self.cache_size else None
+        if key is not None:
+            cached = self._html_cache.get(key)
+            if cached is not None:
+                self._html_cache.move_to_end(key)
+                return cached
+        
+        buffer = io.BytesIO()
+        self._write_report(buffer, results, sidecar_src)
+        html = buffer.getvalue()
+        
+        if key is not None:
+            self._html_cache[key] = html
+            if len(self._html_cache) > self.cache_size:
+                self._html_cache.popitem(last=False)
+        return html
+    
+    @staticmethod
+    def _fingerprint(results: Dict, sidecar_src: Optional[str]) -> bytes:
+        """Hash scan results (independent of key order) for the page cache."""
+        payload = [results, sidecar_src]
+        if orjson is not None:
+            data = orjson.dumps(payload, default=str,
+                                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(payload, default=str, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).digest()
     
-    def _calculate_severity_stats(self, vulnerabilities: List[Dict]) -> Dict[str, int]:
-        """Calculate severity statistics."""
-        stats = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'info': 0}
+    def _write_report(self, f: BinaryIO, results: Dict, sidecar_src: Optional[str] = None):
+        """
+        Write the full interactive HTML report to an open file handle.
         
-        for vuln in vulnerabilities:
-            severity = vuln.get('severity', 'info').lower()
-            if severity in stats:
-                stats[severity] += 1
+        Args:
+            f: Binary file handle to write to
+            results: Scan results dictionary
+            sidecar_src: Relative path of a script holding the vulnerability
+                list, or None to inline the list in the page
+        """
+        vulnerabilities = results.get('vulnerabilities', [])
+        target = results.get('target', 'Unknown')
+        scan_time = results.get('scan_time') or self._default_time
         
-        return stats
+        # Prepare data for JavaScript
+        vuln_data_json = _SIDECAR_GLOBAL if sidecar_src else _dumps_js(vulnerabilities)
+        lazy_cards = len(vulnerabilities) > self.lazy_threshold
+        cards, card_groups, severity_stats, type_stats = self._render_and_stats(
+            vulnerabilities, render_cards=not lazy_cards
+        )
+        
+        self._write_head(f, _escape_html(target).encode('utf-8'), _escape_html(scan_time).encode('utf-8'))
+        # Severity counts in _SEV_ORDER, shared by the stat cards and the chart
+        severity_counts = [severity_stats[severity] for severity in _SEV_ORDER]
+        self._write_stats(f, severity_counts)
+        self._write_cards(f, cards, lazy_cards)
+        self._write_tail(f, vuln_data_json, severity_counts, type_stats,
+                         card_groups, sidecar_src, lazy_cards)
+    
+    def _write_head(self, f: BinaryIO, target: bytes, scan_time: bytes):
+        """Write the document head, styles and report header."""
+        f.write(_HEAD_TMPL % target)
+        f.write(_CSS)
+        # The script reads target and scan time back from the body's data-* attributes
+        f.write(_BODY_TMPL % (target, scan_time, target, scan_time))
+    
+    def _write_stats(self, f: BinaryIO, severity_counts: List[int]):
+        """Write the statistics cards, filter controls and chart canvases."""
+        f.write(_STATS_OPEN)
+        f.write(b''.join(_STAT_CARD_TMPL % (css_class, count, label)
+                         for (css_class, label), count in zip(_SEV_CLASSES, severity_counts)))
+        f.write(_STATS_CLOSE)
+        f.write(_CONTROLS)
+    
+    def _write_cards(self, f: BinaryIO, cards: List[str], lazy_cards: bool = False):
+        """Write the rendered vulnerability cards, or an empty list for the script to fill."""
+        f.write(_CARDS_OPEN)
+        if lazy_cards:
+            f.write(_CARDS_CLOSE)
+            f.write(_CARDS_SENTINEL)
+            return
+        if not cards:
+            f.write(_CARDS_EMPTY)
+        # One encode for the whole section instead of one per card
+        f.write(''.join(cards).encode('utf-8'))
+        f.write(_CARDS_CLOSE)
     
-    def _calculate_type_stats(self, vulnerabilities: List[Dict]) -> Dict[str, int]:
-        """Calculate vulnerability type statistics."""
-        stats = {}
+    def _write_tail(self, f: BinaryIO, vuln_data_json: bytes,
+                    severity_counts: List[int], type_stats: Dict[str, int],
+                    card_groups: List[List[int]], sidecar_src: Optional[str] = None,
+                    lazy_cards: bool = False):
+        """Write the footer and the report script."""
+        f.write(_FOOTER)
+        if sidecar_src:
+            f.write(_SIDECAR_SCRIPT_TMPL % _escape_html(quote(sidecar_src)).encode('utf-8'))
+        f.write(_SCRIPT_DATA_TMPL % (
+            vuln_data_json,
+            _dumps_js(severity_counts),
+            _dumps_js(type_stats),
+            _dumps_js(card_groups),
+            b'true' if lazy_cards else b'false',
+            _CARD_LIMITS_JS
+        ))
+        f.write(_JS_SCAFFOLD)
+    
+    def _render_and_stats(self, vulnerabilities: List[Dict], render_cards: bool = True
+                          ) -> Tuple[List[str], List[List[int]], Dict[str, int], Dict[str, int]]:
+        """
+        Group duplicate findings, render their cards and collect statistics.
         
-        for vuln in vulnerabilities:
-            vuln_type = vuln.get('type', 'Unknown')
-            # Shorten long type names
-            vuln_type = vuln_type[:30] + '...' if len(vuln_type) > 30 else vuln_type
-            stats[vuln_type] = stats.get(vuln_type, 0) + 1
+        Args:
+            vulnerabilities: List of vulnerability dictionaries
+            render_cards: Set to False to only group findings and collect statistics
+            
+        Returns:
+            Tuple of (rendered cards, finding indices per card, severity counts,
+            top 10 type counts)
+        """
+        groups = {}
+        severities = Counter()
+        types = Counter()
         
-        # Get top 10 types
-        sorted_stats = dict(sorted(stats.items(), key=lambda x: x[1], reverse=True)[:10])
-        return sorted_stats
+        for index, vuln in enumerate(vulnerabilities):
+            key = tuple(str(vuln.get(field, _CARD_DEFAULTS[field])) for field in _GROUP_FIELDS)
+            groups.setdefault(key, []).append(index)
+            
+            severities[vuln.get('severity', 'info').lower()] += 1
+            # Shorten long type names
+            vuln_type = vuln.get('type', 'Unknown')
+            types[vuln_type[:30] + '...' if len(vuln_type) > 30 else vuln_type] += 1
+        
+        card_groups = list(groups.values())
+        cards = []
+        if render_cards:
+            cards = [self._render_card(vulnerabilities, members, card_index)
+                     for card_index, members in enumerate(card_groups)]
+        
+        severity_stats = {severity: severities[severity] for severity in _SEV_ORDER}
+        # Get top 10 types (heap selection rather than a full sort)
+        type_stats = dict(types.most_common(10))
+        return cards, card_groups, severity_stats, type_stats
+    
+    def _render_card(self, vulnerabilities: List[Dict], members: List[int], card_index: int) -> str:
+        """Render one card for a group of findings that differ only by URL or evidence."""
+        fields = {**_CARD_DEFAULTS, **vulnerabilities[members[0]]}
+        fields['evidence'] = _truncate(fields['evidence'], _EVIDENCE_LIMIT)
+        fields['description'] = _truncate(fields['description'], _DESCRIPTION_LIMIT)
+        card_fields = {key: _escape_html(fields[key]) for key in _CARD_DEFAULTS}
+        if len(members) > 1:
+            urls = '<br>'.join(_escape_html(vulnerabilities[i].get('url', 'N/A')) for i in members)
+            card_fields['url'] = _URL_LIST_TMPL % (len(members), urls)
+        card_fields['index'] = card_index
+        return _CARD_TMPL % card_fields
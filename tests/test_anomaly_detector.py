@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Regression Tests for ML Anomaly Detection
+Tests for baseline training and per-feature anomaly scoring
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import random
+import statistics
+import unittest
+from datetime import timedelta
+from unittest.mock import Mock, patch
+from modules.ml_detection import anomaly_detector
+from modules.ml_detection.anomaly_detector import Anomaly, MLAnomalyDetector
+from utils.http_client import HTTPClient
+
+
+def make_baseline(count: int = 50):
+    """Build a list of normal-looking responses."""
+    return [
+        {
+            'status_code': 200,
+            'response_time': 0.1 + (i % 5) * 0.01,
+            'content': '<html><body>Welcome page %d</body></html>' % (i % 3),
+            'headers': {'Content-Type': 'text/html', 'Server': 'nginx'}
+        }
+        for i in range(count)
+    ]
+
+
+class TestMLAnomalyDetector(unittest.TestCase):
+    """Test ML anomaly detector training and detection."""
+
+    def setUp(self):
+        self.detector = MLAnomalyDetector({'ml_config': {'min_samples': 10}})
+        self.baseline = make_baseline()
+        self.detector.train_baseline(self.baseline)
+
+    def test_running_stats_match_full_recompute(self):
+        """Test that streaming baseline statistics match a full recomputation."""
+        times = [r['response_time'] for r in self.baseline]
+        stats = self.detector.baseline_stats['response_time']
+
+        self.assertEqual(stats['n'], len(times))
+        self.assertAlmostEqual(stats['mean'], statistics.mean(times))
+        self.assertAlmostEqual(
+            (stats['M2'] / (stats['n'] - 1)) ** 0.5,
+            statistics.stdev(times)
+        )
+
+    def test_running_stats_merge_across_batches(self):
+        """Test that training in several batches gives the same statistics."""
+        detector = MLAnomalyDetector({})
+        detector.train_baseline(self.baseline[:7])
+        detector.train_baseline(self.baseline[7:])
+        times = [r['response_time'] for r in self.baseline]
+        stats = detector.baseline_stats['response_time']
+
+        self.assertEqual(stats['n'], len(times))
+        self.assertAlmostEqual(stats['mean'], statistics.mean(times))
+        self.assertAlmostEqual(stats['M2'] / (stats['n'] - 1), statistics.variance(times))
+
+    def test_constant_features_skipped(self):
+        """Test that zero-variance features are flagged at training and never reported."""
+        self.assertIn('status_code', self.detector._const_features)
+        self.assertIn('header_count', self.detector._const_features)
+        self.assertNotIn('response_time', self.detector._const_features)
+
+        response = dict(self.baseline[0], status_code=500)
+        features = [a['feature'] for a in self.detector.detect_anomalies(response)]
+        self.assertNotIn('status_code', features)
+
+    def test_reservoir_bounds_stored_samples(self):
+        """Test that stored samples are capped while statistics cover every response."""
+        detector = MLAnomalyDetector({'ml_config': {'reservoir_size': 20}})
+        detector.train_baseline(make_baseline(30))
+        detector.train_baseline(make_baseline(70))
+
+        self.assertEqual(detector.baseline_stats['response_time']['n'], 100)
+        self.assertEqual(len(detector.baseline_samples['response_time']), 20)
+        self.assertEqual(detector.baseline_vectors.shape[0], 20)
+        self.assertEqual(len(detector.baseline_content_types), 20)
+        seen_times = {r['response_time'] for r in make_baseline(100)}
+        self.assertTrue(set(detector.baseline_samples['response_time'].tolist()) <= seen_times)
+
+    def test_normal_response_not_flagged(self):
+        """Test that a response matching the baseline produces no anomalies."""
+        anomalies = self.detector.detect_anomalies(self.baseline[0])
+        self.assertEqual(anomalies, [])
+
+    def test_slow_response_flagged(self):
+        """Test that an unusually slow response is reported."""
+        response = dict(self.baseline[0], response_time=5.0)
+        anomalies = self.detector.detect_anomalies(response)
+
+        features = [a['feature'] for a in anomalies]
+        self.assertIn('response_time', features)
+
+    def test_gap_in_multimodal_baseline_flagged(self):
+        """Test that HBOS flags values between two modes of a bimodal feature."""
+        detector = MLAnomalyDetector({'ml_config': {'min_samples': 10}})
+        detector.train_baseline([{'response_time': 0.1 if i % 2 else 1.0} for i in range(50)])
+
+        # 0.55 is the mean of the baseline, so a Z-score test would accept it
+        self.assertEqual(len(detector.find_anomalies({'response_time': 0.55})), 1)
+        self.assertEqual(detector.find_anomalies({'response_time': 1.0}), [])
+
+    def test_threshold_learned_from_training_totals(self):
+        """Test that fresh samples from the training distribution are rarely flagged."""
+        rng = random.Random(1)
+
+        def sample():
+            return {
+                'status_code': 200,
+                'response_time': rng.gauss(0.2, 0.03),
+                'content': 'x' * int(rng.gauss(1000, 50)) + 'abcdef'[:rng.randint(1, 6)],
+                'headers': {'Content-Type': 'text/html'}
+            }
+
+        detector = MLAnomalyDetector({})
+        detector.train_baseline([sample() for _ in range(200)])
+        flagged = [a for _ in range(1000) for a in detector.detect_anomalies(sample())]
+
+        self.assertGreaterEqual(detector.hbos_threshold, detector.anomaly_threshold)
+        self.assertLess(len(flagged), 10)
+        self.assertNotIn('high', [a['severity'] for a in flagged])
+
+    def test_find_anomalies_returns_lightweight_records(self):
+        """Test that raw anomaly records expand to the reported dictionary."""
+        response = dict(self.baseline[0], response_time=5.0)
+        records = self.detector.find_anomalies(response)
+        record = next(r for r in records if r.feature == 'response_time')
+
+        self.assertIsInstance(record, Anomaly)
+        vuln = record.to_dict()
+        self.assertEqual(vuln['type'], 'ML Anomaly Detection')
+        self.assertEqual(vuln['value'], 5.0)
+        self.assertEqual(vuln['severity'], 'high')
+        self.assertEqual(vuln['evidence'], 'Anomalous response_time: 5.0')
+
+    def test_unseen_content_type_flagged(self):
+        """Test that a rare categorical value is reported."""
+        response = dict(self.baseline[0], headers={'Content-Type': 'application/x-java-serialized-object'})
+        anomalies = self.detector.detect_anomalies(response)
+
+        features = [a['feature'] for a in anomalies]
+        self.assertIn('content_type', features)
+
+    def test_entropy_calculation(self):
+        """Test Shannon entropy on known inputs."""
+        self.assertEqual(MLAnomalyDetector._scan_content(b''), (0.0, 0))
+        self.assertEqual(MLAnomalyDetector._scan_content(b'aaaa')[0], 0.0)
+        self.assertAlmostEqual(MLAnomalyDetector._scan_content(b'abab')[0], 1.0)
+        self.assertAlmostEqual(MLAnomalyDetector._scan_content(bytes(range(256)))[0], 8.0)
+
+    def test_error_pattern_counts_distinct_keywords(self):
+        """Test that error keywords are counted once each, case-insensitively."""
+        self.assertEqual(MLAnomalyDetector._scan_content(b'All good')[1], 0)
+        self.assertEqual(MLAnomalyDetector._scan_content(b'Exception! exception!')[1], 1)
+        # 'SQL Error' and 'Syntax Error' also contain 'error'
+        self.assertEqual(MLAnomalyDetector._scan_content(b'SQL Error: Syntax Error near')[1], 3)
+        self.assertEqual(MLAnomalyDetector._scan_content(b'<p>SQL Error near FORBIDDEN</p>')[1], 3)
+        # Every byte value present, so the prefilter rules nothing out
+        self.assertEqual(MLAnomalyDetector._scan_content(bytes(range(256)))[1], 0)
+
+    def test_timing_attack_grouping(self):
+        """Test that timing variance is evaluated per distinct input."""
+        timing_data = [('admin', 0.1), ('admin', 0.9), ('guest', 0.2), ('guest', 0.2)]
+        vulnerabilities = self.detector.detect_timing_attacks(timing_data)
+
+        self.assertEqual(len(vulnerabilities), 1)
+        self.assertEqual(vulnerabilities[0]['cwe'], 'CWE-208: Observable Timing Discrepancy')
+
+    def test_timing_groups_do_not_merge_on_hash_collision(self):
+        """Test that inputs with equal hashes or equal values stay separate."""
+        self.assertEqual(hash(-1), hash(-2))
+        timing_data = [(-1, 0.1), (-1, 0.1), (-2, 5.0), (-2, 5.0),
+                       (1, 0.1), (1, 0.1), (True, 5.0), (True, 5.0),
+                       (['a'], 0.1), (['a'], 0.1)]
+        self.assertEqual(self.detector.detect_timing_attacks(timing_data), [])
+
+    def test_analyze_response_patterns(self):
+        """Test aggregate statistics across responses."""
+        responses = [
+            {'status_code': 200, 'response_time': 0.2, 'content': 'abcd'},
+            {'status_code': 500, 'response_time': 0.4, 'content': 'ab'},
+            {'status_code': 200, 'response_time': 0.6, 'content': ''},
+            {'status_code': 404, 'response_time': 0.8, 'content': 'abcdef'},
+        ]
+        patterns = self.detector.analyze_response_patterns(responses)
+
+        self.assertEqual(patterns['total_responses'], 4)
+        self.assertEqual(sorted(patterns['unique_status_codes']), [200, 404, 500])
+        self.assertAlmostEqual(patterns['avg_response_time'], 0.5)
+        self.assertAlmostEqual(patterns['avg_response_size'], 3.0)
+        self.assertAlmostEqual(patterns['error_rate'], 50.0)
+
+    def test_isolation_forest_flags_outlier_vector(self):
+        """Test that the multivariate model reports a far-off response."""
+        rng = random.Random(0)
+        baseline = [
+            {'status_code': 200, 'response_time': rng.uniform(0.1, 0.3), 'content': 'x' * rng.randint(900, 1100)}
+            for _ in range(200)
+        ]
+        detector = MLAnomalyDetector({'ml_config': {'min_samples': 10, 'isolation_forest': True}})
+        detector.train_baseline(baseline)
+
+        response = dict(baseline[0], response_time=5.0, content='Fatal error: ' * 500)
+        anomalies = detector.detect_anomalies(response)
+
+        features = [a['feature'] for a in anomalies]
+        self.assertIn('multivariate', features)
+
+    def test_content_type_ordinal_encoding(self):
+        """Test that training content types get ordinal codes for the forest."""
+        self.assertIsNone(self.detector.isolation_forest)
+
+        detector = MLAnomalyDetector({'ml_config': {'isolation_forest': True}})
+        detector.train_baseline(self.baseline)
+        self.assertIn('text/html', detector.content_type_codes)
+        self.assertEqual(detector.isolation_forest.n_features_in_, 8)
+
+    def test_content_feature_cache_is_bounded(self):
+        """Test that repeated bodies hit the cache and old entries are evicted."""
+        detector = MLAnomalyDetector({'ml_config': {'feature_cache_size': 2}})
+        first = detector._extract_features({'content': 'SQL error'})
+        again = detector._extract_features({'content': 'SQL error'})
+
+        self.assertEqual(first, again)
+        self.assertEqual(len(detector._feature_cache), 1)
+
+        detector._extract_features({'content': 'page two'})
+        detector._extract_features({'content': 'page three'})
+        self.assertEqual(len(detector._feature_cache), 2)
+
+    def test_parallel_feature_extraction_matches_serial(self):
+        """Test that the process pool path extracts the same features."""
+        detector = MLAnomalyDetector({'ml_config': {'parallel_threshold': 1, 'workers': 2}})
+        pool = anomaly_detector.ProcessPoolExecutor
+        with patch.object(anomaly_detector, 'ProcessPoolExecutor', wraps=pool) as executor, \
+                self.assertNoLogs('modules.ml_detection.anomaly_detector', level='DEBUG'):
+            parallel = detector._extract_batch_features(self.baseline[:8])
+
+        # Workers must not be forked from the threaded scanner process
+        self.assertNotEqual(executor.call_args.kwargs['mp_context'].get_start_method(), 'fork')
+        serial = [self.detector._extract_features(response) for response in self.baseline[:8]]
+
+        self.assertEqual(parallel, serial)
+
+    def test_precomputed_size_is_used(self):
+        """Test that a caller-provided '_size' replaces measuring the body."""
+        features = self.detector._extract_features({'content': 'abc', '_size': 3})
+        self.assertEqual(features['response_size'], 3)
+
+        patterns = self.detector.analyze_response_patterns([{'content': 'abc', '_size': 3}])
+        self.assertEqual(patterns['avg_response_size'], 3.0)
+
+    def test_summarized_http_response_feeds_detector(self):
+        """Test that HTTPClient.summarize_response produces detector input."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {'Content-Type': 'text/html'}
+        mock_response.text = '<html>ok</html>'
+        mock_response.elapsed = timedelta(milliseconds=120)
+        mock_response.history = []
+
+        summary = HTTPClient.summarize_response(mock_response)
+        self.assertEqual(summary['_size'], len(mock_response.text))
+        self.assertAlmostEqual(summary['response_time'], 0.12)
+
+        features = self.detector._extract_features(summary)
+        self.assertEqual(features['content_type'], 'text/html')
+        self.assertEqual(features['redirect_count'], 0)
+
+    def test_untrained_detector_returns_nothing(self):
+        """Test that detection is a no-op without a baseline."""
+        detector = MLAnomalyDetector({})
+        self.assertFalse(detector.is_trained)
+        self.assertEqual(detector.detect_anomalies(self.baseline[0]), [])
+        self.assertTrue(self.detector.is_trained)
+
+
+if __name__ == '__main__':
+    unittest.main()
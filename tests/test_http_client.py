@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Regression Tests for the HTTP Clients
+Tests against a local HTTP server for request handling and connection reuse
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import gzip
+import os
+import json
+import socket
+import threading
+import time
+import unittest
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import PropertyMock, patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils import http_client
+from utils.http_client import (
+    AsyncHTTPClient, HTTPClient, ValidatedBody, close_shared_clients, dns_cache, get_shared_client
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve a few fixed routes and count the requests each one receives."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        if self.path == '/flaky' and self.server.hits[self.path] == 1:
+            self._send(503, b'try again')
+        elif self.path.startswith('/etag'):
+            if self.headers.get('If-None-Match') == '"v1"':
+                self._send(304, b'', {'ETag': '"v1"'})
+            else:
+                self._send(200, b'cacheable body', {'ETag': '"v1"'})
+        elif self.path == '/big':
+            self._send(200, b'A' * 200000)
+        elif self.path == '/euro':
+            self._send(200, ('€' * 10000).encode('utf-8'))
+        elif self.path == '/gzip':
+            self._send(200, gzip.compress(b'B' * 200000), {'Content-Encoding': 'gzip'})
+        elif self.path == '/negotiated':
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                self._send(200, gzip.compress(b'C' * 200000), {'Content-Encoding': 'gzip'})
+            else:
+                self._send(200, b'C' * 200000)
+        elif self.path == '/slow':
+            time.sleep(0.3)
+            self._send(200, b'slow page')
+        else:
+            self._send(200, ('page %s' % self.path).encode('utf-8'))
+
+    def do_POST(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._send(200, b'posted ' + body)
+
+    def do_HEAD(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        if self.path == '/slow':
+            time.sleep(0.3)
+        self._send(405 if self.path == '/big' else 200, b'')
+
+    do_OPTIONS = do_HEAD
+
+    def _send(self, status, body, headers=None):
+        # Recorded before replying so the client never sees an unrecorded response
+        self.server.statuses.append(status)
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """Start one local HTTP server for the test class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.server.hits = {}
+        cls.server.statuses = []
+        cls.base_url = 'http://127.0.0.1:%d' % cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.hits.clear()
+        del self.server.statuses[:]
+
+
+class TestHTTPClient(LocalServerTestCase):
+    """Test the requests-based client."""
+
+    def test_get_returns_response(self):
+        """Test a plain GET against the local server."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        response = client.get(self.base_url + '/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, 'page /')
+
+    def test_per_call_options_override_defaults(self):
+        """Test that timeout/verify passed by a caller replace the client defaults."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'verify_ssl': False}})
+        self.assertFalse(client.session.verify)
+
+        for method in (client.get, client.post, client.head, client.options):
+            response = method(self.base_url + '/', timeout=5, verify=True)
+            self.assertEqual(response.status_code, 200)
+
+    def test_verify_ssl_false_survives_ca_bundle_env(self):
+        """Test that verify_ssl: false is not overridden by REQUESTS_CA_BUNDLE."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'verify_ssl': False, 'response_cache_ttl': 0}})
+        send = requests.adapters.HTTPAdapter.send
+        with patch.dict(os.environ, {'REQUESTS_CA_BUNDLE': '/tmp/ca-bundle.pem'}), \
+                patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=send) as sent:
+            for method in (client.get, client.post, client.head, client.options):
+                self.assertEqual(method(self.base_url + '/').status_code, 200)
+
+        self.assertEqual([c.kwargs['verify'] for c in sent.call_args_list], [False] * 4)
+
+    def test_conditional_get_served_from_cache(self):
+        """Test that a repeat GET revalidates with If-None-Match and reuses the cached body."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'response_cache_ttl': 0}})
+        first = client.get(self.base_url + '/etag')
+        second = client.get(self.base_url + '/etag')
+
+        self.assertEqual(self.server.statuses, [200, 304])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.headers['ETag'], '"v1"')
+
+    def test_etag_cache_bounded_by_body_bytes(self):
+        """Test that the validator cache keeps bodies, not responses, within a byte budget."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'etag_cache_bytes': 20}})
+        client.get(self.base_url + '/etag?page=1')
+        client.get(self.base_url + '/etag?page=2')
+
+        self.assertEqual(len(client._etag_cache), 1)
+        self.assertEqual(client._etag_cache_used, len(b'cacheable body'))
+        entry = next(iter(client._etag_cache.values()))
+        self.assertIsInstance(entry, ValidatedBody)
+        self.assertEqual(entry.content, b'cacheable body')
+
+        # page=1 was evicted, page=2 can still be revalidated
+        client.get(self.base_url + '/etag?page=2')
+        client.get(self.base_url + '/etag?page=1')
+        self.assertEqual(self.server.statuses, [200, 200, 304, 200])
+
+    def test_etag_cache_can_be_disabled(self):
+        """Test that etag_cache: false always downloads the full body."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'etag_cache': False, 'response_cache_ttl': 0}})
+        client.get(self.base_url + '/etag')
+        client.get(self.base_url + '/etag')
+
+        self.assertEqual(self.server.statuses, [200, 200])
+
+    def test_concurrent_identical_gets_coalesced(self):
+        """Test that simultaneous GETs of one URL share a single request."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'response_cache_ttl': 0}})
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(lambda _: client.get(self.base_url + '/slow'), range(5)))
+
+        self.assertEqual(self.server.hits['/slow'], 1)
+        self.assertTrue(all(r is responses[0] for r in responses))
+        self.assertEqual(client._inflight, {})
+
+    def test_completed_responses_not_reused_by_default(self):
+        """Test that sequential GETs all reach the server unless response_cache_ttl is set."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        client.get(self.base_url + '/page')
+        client.get(self.base_url + '/page')
+        self.assertEqual(self.server.hits['/page'], 2)
+
+    def test_recent_response_reused_within_ttl(self):
+        """Test the opt-in short-TTL cache, its POST invalidation and the use_cache=False bypass."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'response_cache_ttl': 5}})
+        client.get(self.base_url + '/page')
+        client.get(self.base_url + '/page')
+        client.head(self.base_url + '/page')
+        client.head(self.base_url + '/page')
+        self.assertEqual(self.server.hits['/page'], 2)
+
+        client.get(self.base_url + '/page', use_cache=False)
+        self.assertEqual(self.server.hits['/page'], 3)
+
+        client.post(self.base_url + '/login', data='user=a')
+        client.get(self.base_url + '/page')
+        self.assertEqual(self.server.hits['/page'], 4)
+
+    def test_body_download_capped(self):
+        """Test that max_body_bytes bounds the decoded body and marks truncation."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'max_body_bytes': 1000}})
+        for path, char in (('/big', b'A'), ('/gzip', b'B')):
+            response = client.get(self.base_url + path)
+            self.assertEqual(response.content, char * 1000)
+            self.assertTrue(response.body_truncated)
+
+        interaction = HTTPClient.capture_interaction(response)
+        self.assertEqual(interaction['response_body'], 'B' * 1000 + '\n... [truncated]')
+
+        response = client.get(self.base_url + '/', max_body_bytes=50)
+        self.assertEqual(response.text, 'page /')
+        self.assertFalse(response.body_truncated)
+
+    def test_capture_decodes_only_kept_prefix(self):
+        """Test that capture_interaction keeps 5000 characters of a multi-byte body."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        response = client.get(self.base_url + '/euro')
+
+        with patch.object(type(response), 'text', new_callable=PropertyMock) as text:
+            body = HTTPClient.capture_interaction(response)['response_body']
+        text.assert_not_called()
+        self.assertEqual(body, '€' * 5000 + '\n... [truncated]')
+
+    def test_capture_only_request_skips_compression(self):
+        """Test that want_full_body=False asks for identity encoding and reads only the capture."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        response = client.get(self.base_url + '/negotiated', want_full_body=False)
+
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(len(response.content), 5000)
+        self.assertTrue(response.body_truncated)
+        self.assertEqual(HTTPClient.capture_interaction(response)['response_body'],
+                         'C' * 5000 + '\n... [truncated]')
+        self.assertEqual(len(client.get(self.base_url + '/negotiated').content), 200000)
+
+    def test_sensitive_headers_redacted_case_insensitively(self):
+        """Test that redaction matches header names regardless of case."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        response = client.get(self.base_url + '/', headers={'authorization': 'Bearer x', 'x-api-KEY': 'k'})
+        headers = HTTPClient.capture_interaction(response)['headers']
+
+        self.assertEqual(headers['authorization'], '[REDACTED]')
+        self.assertEqual(headers['x-api-KEY'], '[REDACTED]')
+        self.assertEqual(headers['User-Agent'], 'Deep-Eye/1.0')
+
+    def test_latency_from_caller_timestamps(self):
+        """Test that latency uses the monotonic clock or a caller-supplied end time."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        start = time.monotonic()
+        response = client.get(self.base_url + '/')
+
+        self.assertEqual(HTTPClient.capture_interaction(response, start_time=10.0, end_time=10.25)['latency'], 0.25)
+        latency = HTTPClient.capture_interaction(response, start_time=start)['latency']
+        self.assertTrue(0 <= latency < 5)
+
+    def test_large_request_body_truncated(self):
+        """Test that long byte request bodies are cut before decoding."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        response = client.post(self.base_url + '/', data=b'x' * 20000)
+
+        interaction = HTTPClient.capture_interaction(response)
+        self.assertEqual(interaction['request_body'], 'x' * 5000 + '\n... [truncated]')
+        self.assertEqual(HTTPClient.capture_interaction(response, request_body=b'')['request_body'], '')
+        self.assertEqual(HTTPClient.capture_interaction(response, request_body=bytearray(b'y' * 6000))['request_body'],
+                         'y' * 5000 + '\n... [truncated]')
+
+    def test_header_lines_in_body_redacted(self):
+        """Test that raw header lines embedded in a request body are redacted."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        body = 'GET /admin HTTP/1.1\r\nHost: x\r\nCookie: session=abc\r\nx-api-key:secret\r\n\r\n'
+        response = client.post(self.base_url + '/', data=body)
+        request_body = HTTPClient.capture_interaction(response)['request_body']
+
+        self.assertEqual(
+            request_body,
+            'GET /admin HTTP/1.1\r\nHost: x\r\nCookie: [REDACTED]\r\nx-api-key: [REDACTED]\r\n\r\n'
+        )
+
+    def test_shared_client_reused_per_settings(self):
+        """Test that get_shared_client returns one instance per distinct configuration."""
+        config = {'scanner': {'timeout': 5, 'user_agent': 'shared-test'}}
+        client = get_shared_client(custom_headers={'X-Test': '1'}, config=config)
+
+        self.assertIs(get_shared_client(custom_headers={'X-Test': '1'}, config=dict(config)), client)
+        self.assertIsNot(get_shared_client(config=config), client)
+
+        close_shared_clients()
+        self.assertIsNot(get_shared_client(custom_headers={'X-Test': '1'}, config=config), client)
+        close_shared_clients()
+
+    def test_dns_lookups_cached_across_connections(self):
+        """Test that new connections to a known host skip name resolution."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'response_cache_ttl': 0}})
+        url = 'http://localhost:%d/' % self.server.server_address[1]
+        dns_cache.clear()
+
+        with patch('socket.getaddrinfo', wraps=socket.getaddrinfo) as getaddrinfo:
+            for _ in range(3):
+                # Connection: close forces a fresh socket per request
+                self.assertEqual(client.get(url, headers={'Connection': 'close'}).status_code, 200)
+
+        lookups = [c for c in getaddrinfo.call_args_list if c.args[0] == 'localhost']
+        self.assertEqual(len(lookups), 1)
+
+    def test_probe_uses_head_then_ranged_get(self):
+        """Test that probe() avoids bodies and falls back to a bounded GET when HEAD is refused."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        response = client.probe(self.base_url + '/page')
+        self.assertEqual(response.request.method, 'HEAD')
+        self.assertEqual(response.content, b'')
+
+        # The test server ignores Range, so max_body_bytes does the limiting
+        response = client.probe(self.base_url + '/big')
+        self.assertEqual(response.request.method, 'GET')
+        self.assertEqual(response.request.headers['Range'], 'bytes=0-4095')
+        self.assertEqual(len(response.content), 4096)
+        self.assertEqual(self.server.statuses, [200, 405, 200])
+
+    def test_warmup_opens_pooled_connections(self):
+        """Test that warmup leaves several idle connections in the host's pool."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        self.assertEqual(client.warmup([self.base_url + '/slow'], per_host=4), 4)
+        self.assertEqual(self.server.hits['/slow'], 4)
+
+        pools = client.session.get_adapter(self.base_url).poolmanager.pools
+        pool, = [pools[key] for key in pools.keys()]
+        self.assertEqual(len([conn for conn in pool.pool.queue if conn]), 4)
+        self.assertEqual(client.warmup([]), 0)
+
+    def test_json_post_and_parse(self):
+        """Test JSON bodies with and without orjson available."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0}})
+        for encoder in (http_client.orjson, None):
+            with patch.object(http_client, 'orjson', encoder):
+                response = client.post(self.base_url + '/', json={'a': [1, 'é']})
+                self.assertEqual(response.request.headers['Content-Type'], 'application/json')
+                self.assertEqual(json.loads(response.request.body), {'a': [1, 'é']})
+
+                response._content = b'{"a": [1, 2]}'
+                self.assertEqual(HTTPClient.parse_json(response), {'a': [1, 2]})
+                response._content = b'not json'
+                self.assertRaises(json.JSONDecodeError, HTTPClient.parse_json, response)
+
+        # Values orjson cannot encode still go through requests
+        response = client.post(self.base_url + '/', json={1: 'x'})
+        self.assertEqual(json.loads(response.request.body), {'1': 'x'})
+
+    def test_circuit_breaker_skips_dead_host(self):
+        """Test that repeated connection failures make later requests to the host fail fast."""
+        client = HTTPClient(config={'scanner': {'max_retries': 0, 'breaker_threshold': 2}})
+        dead = 'http://127.0.0.1:1'
+        with self.assertLogs('utils.http_client', level='WARNING') as logs:
+            for path in ('/a', '/b'):
+                self.assertIsNone(client.get(dead + path))
+        self.assertIn('skipping its requests', logs.output[0])
+
+        with patch.object(client.session, 'get') as send, patch.object(client.session, 'post') as post:
+            self.assertIsNone(client.get(dead + '/c'))
+            self.assertIsNone(client.post(dead + '/c'))
+        send.assert_not_called()
+        post.assert_not_called()
+
+        self.assertEqual(client.get(self.base_url + '/').status_code, 200)
+
+    def test_read_timeouts_do_not_open_breaker(self):
+        """Test that a slow but reachable host (e.g. time-based payloads) is not skipped."""
+        client = HTTPClient(config={'scanner': {'max_retries': 1, 'breaker_threshold': 2}})
+        for _ in range(2):
+            self.assertIsNone(client.get(self.base_url + '/slow', timeout=0.1, use_cache=False))
+
+        self.assertEqual(client._breaker_until, {})
+        self.assertEqual(client.get(self.base_url + '/').status_code, 200)
+
+    def test_pool_size_configuration(self):
+        """Test that pool sizes come from config, with constructor arguments taking precedence."""
+        client = HTTPClient(config={'scanner': {'pool_connections': 7, 'pool_maxsize': 30}})
+        adapter = client.session.get_adapter(self.base_url)
+        self.assertEqual(adapter._pool_connections, 7)
+        self.assertEqual(adapter._pool_maxsize, 30)
+
+        client = HTTPClient(config={'scanner': {'pool_maxsize': 30}}, pool_maxsize=50)
+        self.assertEqual(client.session.get_adapter(self.base_url)._pool_maxsize, 50)
+
+
+class TestHTTPXEngine(LocalServerTestCase):
+    """Test HTTPClient with scanner.http_engine set to httpx."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = HTTPClient(
+            custom_headers={'Authorization': 'Bearer x'},
+            config={'scanner': {'http_engine': 'httpx', 'max_retries': 1, 'response_cache_ttl': 0}}
+        )
+        self.addCleanup(self.client.close)
+
+    def test_responses_are_requests_compatible(self):
+        """Test that httpx responses come back as requests.Response objects."""
+        response = self.client.post(self.base_url + '/', data='a=1')
+        interaction = HTTPClient.capture_interaction(response)
+
+        self.assertEqual(self.client.engine, 'httpx')
+        self.assertIsInstance(response, requests.Response)
+        self.assertEqual(response.text, 'posted a=1')
+        self.assertEqual(interaction['request_body'], 'a=1')
+        self.assertEqual(interaction['headers']['authorization'], '[REDACTED]')
+
+    def test_retry_and_body_cap(self):
+        """Test status retries and max_body_bytes on the httpx engine."""
+        self.assertEqual(self.client.get(self.base_url + '/flaky').status_code, 200)
+        self.assertEqual(self.server.hits['/flaky'], 2)
+
+        response = self.client.get(self.base_url + '/gzip', max_body_bytes=10)
+        self.assertEqual(response.content, b'B' * 10)
+        self.assertTrue(response.body_truncated)
+
+    def test_connection_error_returns_none(self):
+        """Test that httpx transport errors are reported like requests errors."""
+        self.assertIsNone(self.client.get('http://127.0.0.1:1/'))
+
+
+class TestAsyncHTTPClient(LocalServerTestCase):
+    """Test the aiohttp-based client."""
+
+    def test_batch_get_preserves_order(self):
+        """Test that concurrent GETs come back in request order with bodies read."""
+        client = AsyncHTTPClient(config={'scanner': {'max_retries': 0}})
+        urls = ['%s/page%d' % (self.base_url, i) for i in range(20)]
+        responses = client.batch_get_sync(urls)
+
+        self.assertEqual([r.status for r in responses], [200] * 20)
+        self.assertEqual([r._body for r in responses],
+                         [('page /page%d' % i).encode('utf-8') for i in range(20)])
+
+    def test_retryable_status_is_retried(self):
+        """Test that a 503 is retried like the synchronous client's Retry policy."""
+        client = AsyncHTTPClient(config={'scanner': {'max_retries': 2}})
+        response = client.batch_get_sync([self.base_url + '/flaky'])[0]
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.server.hits['/flaky'], 2)
+
+    def test_connection_error_returns_none(self):
+        """Test that an unreachable host yields None instead of raising."""
+        client = AsyncHTTPClient(config={'scanner': {'max_retries': 0, 'timeout': 2}})
+        self.assertEqual(client.batch_get_sync(['http://127.0.0.1:1/']), [None])
+
+
+if __name__ == '__main__':
+    unittest.main()
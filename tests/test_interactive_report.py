@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Regression Tests for Interactive HTML Reports
+Tests for report rendering, statistics and file output
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from modules.reporting import interactive_report
+from modules.reporting.interactive_report import InteractiveReportGenerator
+
+
+def make_results():
+    """Build a small scan result set."""
+    return {
+        'target': 'https://example.com',
+        'scan_time': '2025-01-01T00:00:00',
+        'vulnerabilities': [
+            {
+                'severity': 'high',
+                'type': 'SQL Injection',
+                'url': 'https://example.com/item?id=1',
+                'description': 'Error-based SQL injection',
+                'evidence': 'You have an error in your SQL syntax',
+                'remediation': 'Use parameterized queries'
+            },
+            {
+                'severity': 'critical',
+                'type': 'Remote Code Execution',
+                'url': 'https://example.com/run',
+                'description': 'Command injection in cmd parameter',
+                'evidence': 'uid=0(root)',
+                'remediation': 'Never pass user input to a shell'
+            },
+            {'severity': 'low', 'type': 'Information Disclosure'}
+        ]
+    }
+
+
+class TestInteractiveReportGenerator(unittest.TestCase):
+    """Test interactive report generation."""
+
+    def setUp(self):
+        self.generator = InteractiveReportGenerator({})
+        self.results = make_results()
+
+    def test_streamed_file_matches_built_html(self):
+        """Test that the file written section by section matches the in-memory build."""
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, 'report.html')
+            path = self.generator.generate_interactive_report(self.results, output_file)
+
+            self.assertEqual(path, output_file)
+            with open(output_file, encoding='utf-8') as f:
+                written = f.read()
+
+        self.assertEqual(written, self.generator._build_interactive_html(self.results))
+        self.assertTrue(written.startswith('<!DOCTYPE html>'))
+        self.assertTrue(written.endswith('</html>'))
+
+    def test_identical_results_reuse_cached_page(self):
+        """Test that the page cache is keyed on content and bounded."""
+        generator = InteractiveReportGenerator({'reporting': {'interactive_cache_size': 2}})
+        first = generator._build_report_bytes(self.results)
+        again = generator._build_report_bytes(make_results())
+
+        self.assertIs(first, again)
+        self.assertEqual(len(generator._html_cache), 1)
+
+        for target in ('https://a.example', 'https://b.example'):
+            html = generator._build_interactive_html(dict(self.results, target=target))
+            self.assertIn('Target: %s<br>' % target, html)
+        self.assertEqual(len(generator._html_cache), 2)
+
+    def test_pages_not_cached_by_default(self):
+        """Test that reports stream to disk unless the page cache is enabled."""
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, 'report.html')
+            with patch.object(self.generator, '_build_report_bytes') as build:
+                self.generator.generate_interactive_report(self.results, output_file)
+
+        build.assert_not_called()
+        self.assertEqual(len(self.generator._html_cache), 0)
+
+    def test_large_report_uses_sidecar(self):
+        """Test that big vulnerability lists are loaded from a sidecar script."""
+        generator = InteractiveReportGenerator({'reporting': {'interactive_sidecar_threshold': 2}})
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, 'report.html')
+            generator.generate_interactive_report(self.results, output_file)
+
+            with open(output_file, encoding='utf-8') as f:
+                html = f.read()
+            with open(output_file + '.vulns.js', encoding='utf-8') as f:
+                sidecar = f.read()
+
+        self.assertIn('<script src="report.html.vulns.js"></script>', html)
+        self.assertIn('const vulnerabilities = window.deepEyeVulnerabilities;', html)
+        self.assertNotIn('Use parameterized queries"', html)
+        self.assertTrue(sidecar.startswith('window.deepEyeVulnerabilities = [{'))
+
+    def test_every_vulnerability_rendered(self):
+        """Test that each finding gets a card."""
+        html = self.generator._build_interactive_html(self.results)
+        page = html.split('<script>')[0]
+        self.assertEqual(page.count('<div class="vuln-card '), 3)
+        self.assertIn('<div class="vuln-card low" id="v2">', html)
+        self.assertIn('SQL Injection', html)
+        self.assertIn('No evidence available', html)
+
+    def test_duplicate_findings_share_a_card(self):
+        """Test that findings differing only by URL are grouped onto one card."""
+        vulnerabilities = [
+            {'type': 'XSS', 'severity': 'high', 'url': 'https://example.com/%d' % i}
+            for i in range(3)
+        ] + [{'type': 'XSS', 'severity': 'low', 'url': 'https://example.com/other'}]
+        cards, groups, stats, _ = self.generator._render_and_stats(vulnerabilities)
+
+        self.assertEqual(groups, [[0, 1, 2], [3]])
+        self.assertEqual(len(cards), 2)
+        self.assertIn('<summary>3 affected URLs</summary>', cards[0])
+        self.assertIn('https://example.com/2', cards[0])
+        self.assertEqual(stats['high'], 3)
+
+    def test_large_report_renders_cards_lazily(self):
+        """Test that big reports leave card rendering to the browser."""
+        generator = InteractiveReportGenerator({'reporting': {'interactive_lazy_threshold': 2}})
+        html = generator._build_interactive_html(self.results)
+        page = html.split('<script>')[0]
+
+        self.assertNotIn('<div class="vuln-card ', page)
+        self.assertIn('<div id="cardSentinel"></div>', page)
+        self.assertIn('const lazyCards = true;', html)
+
+    def test_fields_are_html_escaped(self):
+        """Test that scanned content cannot inject markup into the report."""
+        payload = '<script>alert("x")</script>'
+        results = {
+            'target': "https://example.com/?q='><b>",
+            'vulnerabilities': [{'severity': 'high', 'type': 'XSS', 'evidence': payload}]
+        }
+        html = self.generator._build_interactive_html(results)
+
+        self.assertNotIn(payload, html)
+        self.assertIn('&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt;', html)
+        self.assertIn('Target: https://example.com/?q=&#39;&gt;&lt;b&gt;<br>', html)
+        self.assertIn('<body data-target="https://example.com/?q=&#39;&gt;&lt;b&gt;"', html)
+
+    def test_script_data_is_compact_and_cannot_close_script(self):
+        """Test the embedded JSON with and without orjson available."""
+        vulnerabilities = [{'type': 'XSS', 'evidence': '</script><b>café</b>'}]
+        for encoder in (interactive_report.orjson, None):
+            with patch.object(interactive_report, 'orjson', encoder):
+                data = interactive_report._dumps_js(vulnerabilities)
+
+            self.assertEqual(data.decode('utf-8'), '[{"type":"XSS","evidence":"<\\/script><b>café<\\/b>"}]')
+
+    def test_long_evidence_truncated_in_cards_only(self):
+        """Test that cards cut long evidence while the embedded data keeps it whole."""
+        evidence = 'A' * 5000
+        html = self.generator._build_interactive_html({'vulnerabilities': [{'evidence': evidence}]})
+
+        self.assertIn('A' * 2048 + '… [truncated]</div>', html)
+        self.assertIn('"evidence":"%s"' % evidence, html)
+
+    def test_empty_report(self):
+        """Test that a scan without findings still renders."""
+        html = self.generator._build_interactive_html({'target': 'https://example.com'})
+        self.assertIn('No vulnerabilities found!', html)
+
+    def test_severity_stats(self):
+        """Test severity counting."""
+        cards, _, stats, _ = self.generator._render_and_stats(self.results['vulnerabilities'])
+        self.assertEqual(len(cards), 3)
+        self.assertEqual(stats, {'critical': 1, 'high': 1, 'medium': 0, 'low': 1, 'info': 0})
+
+    def test_type_stats_truncated_and_limited(self):
+        """Test that long type names are shortened and only the top 10 kept."""
+        vulnerabilities = [{'type': 'Type %d' % i} for i in range(12)]
+        vulnerabilities += [{'type': 'A' * 40}] * 3
+        _, _, _, stats = self.generator._render_and_stats(vulnerabilities)
+
+        self.assertEqual(len(stats), 10)
+        self.assertEqual(next(iter(stats)), 'A' * 30 + '...')
+        self.assertEqual(stats['A' * 30 + '...'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
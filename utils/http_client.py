@@ -2,15 +2,172 @@
 HTTP Client for making requests
 """
 
+import asyncio
+import atexit
+import re
+import ipaddress
 import requests
+import socket
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import HTTPError as URLLib3Error, ReadTimeoutError
+from urllib3.util import connection as urllib3_connection
 from urllib3.util.retry import Retry
 from utils.logger import get_logger
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+# Statuses retried by both clients, mirroring the urllib3 Retry configuration
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Headers a 304 Not Modified may carry that refresh the cached response
+NOT_MODIFIED_HEADERS = ('Date', 'ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Vary')
+
+# Bodies larger than this are not kept in the conditional GET cache
+ETAG_CACHE_MAX_BODY = 256 << 10
+
+# What the conditional GET cache keeps of a 200 response to rebuild it from a 304
+ValidatedBody = namedtuple('ValidatedBody', 'content headers encoding')
+
+# Upper bound on responses held by the short-TTL GET/HEAD cache
+RECENT_CACHE_MAX = 1024
+
+# Statuses meaning the server does not support HEAD, so probe() falls back to GET
+HEAD_UNSUPPORTED = frozenset({405, 501})
+
+# Body bytes requested by probe()'s ranged GET fallback
+PROBE_BODY_BYTES = 4096
+
+# Upper bound on threads used by warmup()
+WARMUP_MAX_WORKERS = 64
+
+# Characters of request/response body kept by capture_interaction
+CAPTURE_BODY_LIMIT = 5000
+
+# Request headers (lowercase) redacted in captured interactions
+SENSITIVE_HEADERS = frozenset({'authorization', 'cookie', 'x-api-key', 'api-key'})
+
+# "Name: value" lines for the same headers inside raw request bodies (e.g.
+# smuggled or pipelined requests), matched in one pass over the body
+SENSITIVE_LINE_RE = re.compile(
+    r'(?i)\b(%s)[ \t]*:[ \t]*[^\r\n]+' % '|'.join(
+        re.escape(name) for name in sorted(SENSITIVE_HEADERS, key=len, reverse=True)
+    )
+)
+
+
+def _is_host_failure(error: Exception) -> bool:
+    """
+    Return True for errors meaning the host could not be reached at all.
+    
+    ConnectionError covers refused connections, DNS failures and connect
+    timeouts. Read timeouts are excluded: the host answered the connection and
+    is just slow, which is the expected outcome of time-based payloads. With a
+    Retry policy they surface as a ConnectionError wrapping ReadTimeoutError.
+    """
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return not isinstance(reason, ReadTimeoutError)
+
+
+class DNSCache:
+    """
+    TTL-bounded LRU of getaddrinfo() results, shared by every HTTPClient.
+    
+    Installed by patching urllib3's create_connection, which requests uses to
+    open sockets, so repeated connections to a target skip name resolution.
+    """
+    
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._create_connection = None
+    
+    def resolve(self, host: str, port: int, family: int) -> List[Tuple]:
+        """Return getaddrinfo() results for host:port, from cache while fresh."""
+        key = (host, port, family)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+        
+        addresses = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return addresses
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def install(self):
+        """Route urllib3 connections through the cache (idempotent)."""
+        if self._create_connection is None:
+            self._create_connection = urllib3_connection.create_connection
+            urllib3_connection.create_connection = self.create_connection
+    
+    def uninstall(self):
+        if self._create_connection is not None:
+            urllib3_connection.create_connection = self._create_connection
+            self._create_connection = None
+    
+    def create_connection(self, address: Tuple[str, int], *args, **kwargs) -> socket.socket:
+        """Drop-in for urllib3's create_connection that connects to cached addresses."""
+        host, port = address
+        host = host.strip('[]')
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return self._create_connection(address, *args, **kwargs)
+        
+        error = None
+        for *_, sockaddr in self.resolve(host, port, urllib3_connection.allowed_gai_family()):
+            try:
+                return self._create_connection((sockaddr[0], port), *args, **kwargs)
+            except OSError as e:
+                error = e
+        raise error or OSError("getaddrinfo returned an empty list")
+
+
+dns_cache = DNSCache()
+
 
 class HTTPClient:
     """HTTP client with retry logic and configuration."""
@@ -20,9 +177,23 @@ class HTTPClient:
         proxy: Optional[str] = None,
         custom_headers: Optional[Dict] = None,
         cookies: Optional[Dict] = None,
-        config: Optional[Dict] = None
+        config: Optional[Dict] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None
     ):
-        """Initialize HTTP client."""
+        """
+        Initialize HTTP client.
+        
+        pool_connections is the number of per-host pools kept and pool_maxsize the
+        number of keep-alive connections kept per host. The defaults (100 each) are
+        sized for threaded scans of a single target, so sockets are reused instead of
+        discarded with "Connection pool is full". Each pooled connection holds a
+        file descriptor, so lower them when running under a tight ulimit.
+        
+        scanner.http_engine: httpx sends requests through httpx instead, using
+        HTTP/2 (when the h2 package is installed and scanner.http2 is not false)
+        so concurrent requests to a host multiplex over one connection.
+        """
         self.config = config or {}
         scanner_config = self.config.get('scanner', {})
         
@@ -30,6 +201,43 @@ class HTTPClient:
         self.verify_ssl = scanner_config.get('verify_ssl', True)
         self.max_retries = scanner_config.get('max_retries', 3)
         self.user_agent = scanner_config.get('user_agent', 'Deep-Eye/1.0')
+        self.pool_connections = pool_connections or scanner_config.get('pool_connections', 100)
+        self.pool_maxsize = pool_maxsize or scanner_config.get('pool_maxsize', 100)
+        
+        # Validator cache for conditional GETs: key -> body and headers of the
+        # last 200 response with an ETag or Last-Modified header, bounded by
+        # total body bytes since the client is shared process-wide. 0 disables it.
+        self.etag_cache_bytes = (
+            scanner_config.get('etag_cache_bytes', 8 << 20) if scanner_config.get('etag_cache', True) else 0
+        )
+        self._etag_cache = OrderedDict()
+        self._etag_cache_used = 0
+        self._etag_lock = threading.Lock()
+        
+        # Identical GET/HEAD requests in flight at the same time share one round
+        # trip. Completed responses can also be reused for response_cache_ttl
+        # seconds; that is off by default because the cache key ignores session
+        # state such as cookies set after a login
+        self.response_cache_ttl = scanner_config.get('response_cache_ttl', 0)
+        self._inflight = {}
+        self._recent = OrderedDict()
+        self._inflight_lock = threading.Lock()
+        
+        # Default cap on downloaded body bytes; None reads bodies in full
+        self.max_body_bytes = scanner_config.get('max_body_bytes')
+        
+        # Per-host circuit breaker: after breaker_threshold consecutive connection
+        # failures, requests to the host fail fast for breaker_cooldown seconds.
+        # A threshold of 0 disables it.
+        self.breaker_threshold = scanner_config.get('breaker_threshold', 5)
+        self.breaker_cooldown = scanner_config.get('breaker_cooldown', 30.0)
+        self._failure_counts = {}
+        self._breaker_until = {}
+        self._breaker_lock = threading.Lock()
+        
+        if scanner_config.get('dns_cache', True):
+            dns_cache.ttl = scanner_config.get('dns_cache_ttl', dns_cache.ttl)
+            dns_cache.install()
         
         # Create session
         self.session = requests.Session()
@@ -38,10 +246,15 @@ class HTTPClient:
         retry_strategy = Retry(
             total=self.max_retries,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=sorted(RETRY_STATUSES),
             allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=False
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -67,6 +280,26 @@ class HTTPClient:
                 'http': proxy,
                 'https': proxy
             }
+        
+        # timeout and verify are filled in per request unless the caller passed
+        # them: requests has no session-level timeout, and REQUESTS_CA_BUNDLE /
+        # CURL_CA_BUNDLE override a session-level verify=False
+        self.session.verify = self.verify_ssl
+        
+        self.engine = scanner_config.get('http_engine', 'requests')
+        if self.engine == 'httpx':
+            if httpx is None:
+                logger.warning("httpx is not installed, falling back to the requests engine")
+                self.engine = 'requests'
+            else:
+                self.session = HTTPXSession(
+                    self.session,
+                    timeout=self.timeout,
+                    verify=self.verify_ssl,
+                    max_retries=self.max_retries,
+                    http2=scanner_config.get('http2', True) and h2 is not None,
+                    max_connections=self.pool_maxsize
+                )
     
     def get(
         self,
@@ -74,23 +307,216 @@ class HTTPClient:
         params: Optional[Dict] = None,
         headers: Optional[Dict] = None,
         allow_redirects: bool = True,
+        use_cache: bool = True,
+        max_body_bytes: Optional[int] = None,
+        want_full_body: bool = True,
         **kwargs
     ) -> Optional[requests.Response]:
-        """Make GET request."""
+        """
+        Make GET request.
+        
+        Concurrent identical GETs are coalesced into one request, and with
+        scanner.response_cache_ttl set the response is reused for that many
+        seconds (any POST clears those responses). Repeat GETs of a URL that
+        previously returned an ETag or Last-Modified header are sent as
+        conditional requests; a 304 reply is answered from the cached body.
+        Pass use_cache=False when every call must reach the server (e.g. rate
+        limit probing).
+        
+        max_body_bytes (default scanner.max_body_bytes) limits how much of the
+        body is downloaded; see _read_capped. want_full_body=False is for
+        callers that only capture_interaction() the response: the body is
+        requested uncompressed and read only as far as the capture keeps.
+        """
+        max_body_bytes = max_body_bytes or self.max_body_bytes
+        if not want_full_body:
+            headers, max_body_bytes = self._capture_only(headers, max_body_bytes)
+        cache_key = None
+        if use_cache and not kwargs.get('stream'):
+            cache_key = self._request_key(
+                'GET', url, params, headers, allow_redirects, dict(kwargs, max_body_bytes=max_body_bytes)
+            )
+        if cache_key is None:
+            return self._get(url, params, headers, allow_redirects, None, max_body_bytes, **kwargs)
+        return self._coalesce(
+            cache_key,
+            lambda: self._get(url, params, headers, allow_redirects, cache_key, max_body_bytes, **kwargs)
+        )
+    
+    def _get(
+        self,
+        url: str,
+        params: Optional[Dict],
+        headers: Optional[Dict],
+        allow_redirects: bool,
+        cache_key: Optional[Tuple],
+        max_body_bytes: Optional[int],
+        **kwargs
+    ) -> Optional[requests.Response]:
+        """Send a GET, revalidating against the ETag cache when cache_key is given."""
+        cached = None
+        if not self.etag_cache_bytes:
+            cache_key = None
+        elif cache_key is not None:
+            cached = self._etag_lookup(cache_key)
+            if cached is not None:
+                headers = dict(headers or {})
+                if 'ETag' in cached.headers:
+                    headers.setdefault('If-None-Match', cached.headers['ETag'])
+                if 'Last-Modified' in cached.headers:
+                    headers.setdefault('If-Modified-Since', cached.headers['Last-Modified'])
+        
+        host = urlsplit(url).netloc.lower()
+        if self._circuit_open(host):
+            return None
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('verify', self.verify_ssl)
         try:
             response = self.session.get(
                 url,
                 params=params,
                 headers=headers,
-                timeout=self.timeout,
-                verify=self.verify_ssl,
                 allow_redirects=allow_redirects,
+                stream=kwargs.pop('stream', False) or bool(max_body_bytes),
                 **kwargs
             )
-            return response
-        except requests.exceptions.RequestException as e:
+            if max_body_bytes:
+                self._read_capped(response, max_body_bytes)
+        except (requests.exceptions.RequestException, URLLib3Error) as e:
             logger.debug(f"GET request failed for {url}: {e}")
+            self._record_failure(host, e)
             return None
+        self._record_success(host)
+        
+        if cache_key is not None:
+            response = self._etag_store(cache_key, cached, response)
+        return response
+    
+    @staticmethod
+    def _request_key(
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        allow_redirects: bool = True,
+        extra: Optional[Dict] = None
+    ) -> Optional[Tuple]:
+        """Build a hashable key for a request, or None if its arguments are not simple mappings."""
+        try:
+            key = (
+                method,
+                url,
+                frozenset((params or {}).items()),
+                frozenset((headers or {}).items()),
+                allow_redirects,
+                frozenset((extra or {}).items())
+            )
+            hash(key)
+        except (AttributeError, TypeError):
+            return None
+        return key
+    
+    def _coalesce(self, key: Tuple, fetch) -> Optional[requests.Response]:
+        """
+        Run fetch() once for all concurrent callers with the same key.
+        
+        Args:
+            key: Request key from _request_key
+            fetch: Callable performing the request
+        
+        Returns:
+            The shared response (None if the request failed)
+        """
+        now = time.monotonic()
+        with self._inflight_lock:
+            recent = self._recent.get(key)
+            if recent is not None and recent[0] > now:
+                return recent[1]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            response = fetch()
+        except BaseException as e:
+            with self._inflight_lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        
+        with self._inflight_lock:
+            if response is not None and self.response_cache_ttl > 0:
+                self._recent.pop(key, None)
+                self._recent[key] = (time.monotonic() + self.response_cache_ttl, response)
+                # Entries share one TTL, so insertion order is expiry order
+                while self._recent and (
+                    len(self._recent) > RECENT_CACHE_MAX or next(iter(self._recent.values()))[0] <= now
+                ):
+                    self._recent.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(response)
+        return response
+    
+    def _etag_lookup(self, key: Tuple) -> Optional[ValidatedBody]:
+        """Return the cached body for key, marking it recently used."""
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+            if cached is not None:
+                self._etag_cache.move_to_end(key)
+            return cached
+    
+    def _etag_store(
+        self,
+        key: Tuple,
+        cached: Optional[ValidatedBody],
+        response: requests.Response
+    ) -> requests.Response:
+        """
+        Resolve a 304 against the cache, or remember a cacheable 200 response.
+        
+        Args:
+            key: Request key from _request_key
+            cached: Entry the conditional headers were taken from, if any
+            response: Response just received
+        
+        Returns:
+            The response to hand back to the caller
+        """
+        if response.status_code == 304 and cached is not None:
+            # Same body as before; the 304 keeps its own timing, request and
+            # cookies and contributes refreshed validators
+            headers = CaseInsensitiveDict(cached.headers)
+            for name in NOT_MODIFIED_HEADERS:
+                if name in response.headers:
+                    headers[name] = response.headers[name]
+            response.status_code = 200
+            response.reason = 'OK'
+            response.headers = headers
+            response.encoding = cached.encoding
+            response._content = cached.content
+            response._content_consumed = True
+            entry = cached._replace(headers=CaseInsensitiveDict(headers))
+        elif (response.status_code != 200 or response.history or getattr(response, 'body_truncated', False)
+              or not ('ETag' in response.headers or 'Last-Modified' in response.headers)
+              or len(response.content) > ETAG_CACHE_MAX_BODY):
+            return response
+        else:
+            entry = ValidatedBody(response.content, CaseInsensitiveDict(response.headers), response.encoding)
+        
+        with self._etag_lock:
+            previous = self._etag_cache.pop(key, None)
+            if previous is not None:
+                self._etag_cache_used -= len(previous.content)
+            self._etag_cache[key] = entry
+            self._etag_cache_used += len(entry.content)
+            while self._etag_cache_used > self.etag_cache_bytes:
+                _, evicted = self._etag_cache.popitem(last=False)
+                self._etag_cache_used -= len(evicted.content)
+        return response
     
     def post(
         self,
@@ -98,57 +524,281 @@ class HTTPClient:
         data: Optional[Dict] = None,
         json: Optional[Dict] = None,
         headers: Optional[Dict] = None,
+        max_body_bytes: Optional[int] = None,
+        want_full_body: bool = True,
         **kwargs
     ) -> Optional[requests.Response]:
-        """Make POST request."""
+        """
+        Make POST request. max_body_bytes and want_full_body work as in get().
+        
+        json payloads are serialized with orjson when it is installed (compact
+        output); values orjson cannot encode fall back to requests' encoder.
+        """
+        max_body_bytes = max_body_bytes or self.max_body_bytes
+        if json is not None and orjson is not None and data is None:
+            try:
+                data = orjson.dumps(json)
+            except TypeError:
+                pass
+            else:
+                json = None
+                headers = dict(headers or {})
+                if not any(name.lower() == 'content-type' for name in headers):
+                    headers['Content-Type'] = 'application/json'
+        if not want_full_body:
+            headers, max_body_bytes = self._capture_only(headers, max_body_bytes)
+        host = urlsplit(url).netloc.lower()
+        if self._circuit_open(host):
+            return None
+        if self._recent:
+            # The POST may change what cached GETs would return
+            with self._inflight_lock:
+                self._recent.clear()
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('verify', self.verify_ssl)
         try:
             response = self.session.post(
                 url,
                 data=data,
                 json=json,
                 headers=headers,
-                timeout=self.timeout,
-                verify=self.verify_ssl,
+                stream=kwargs.pop('stream', False) or bool(max_body_bytes),
                 **kwargs
             )
-            return response
-        except requests.exceptions.RequestException as e:
+            if max_body_bytes:
+                self._read_capped(response, max_body_bytes)
+        except (requests.exceptions.RequestException, URLLib3Error) as e:
             logger.debug(f"POST request failed for {url}: {e}")
+            self._record_failure(host, e)
             return None
+        self._record_success(host)
+        return response
     
-    def head(self, url: str, **kwargs) -> Optional[requests.Response]:
-        """Make HEAD request."""
-        try:
-            response = self.session.head(
-                url,
-                timeout=self.timeout,
-                verify=self.verify_ssl,
-                **kwargs
-            )
+    def close(self):
+        """Close the session and release pooled connections."""
+        self.session.close()
+    
+    def head(self, url: str, use_cache: bool = True, **kwargs) -> Optional[requests.Response]:
+        """Make HEAD request, coalesced and cached like get()."""
+        cache_key = self._request_key('HEAD', url, extra=kwargs) if use_cache else None
+        if cache_key is None:
+            return self._head(url, **kwargs)
+        return self._coalesce(cache_key, lambda: self._head(url, **kwargs))
+    
+    def probe(self, url: str, **kwargs) -> Optional[requests.Response]:
+        """
+        Fetch the status and headers of a URL without downloading its body.
+        
+        Sends a HEAD (following redirects). Servers that reject HEAD get a GET for
+        the first PROBE_BODY_BYTES bytes instead, asked for with a Range header
+        and enforced with max_body_bytes in case the range is ignored.
+        
+        Args:
+            url: URL to probe
+            **kwargs: Extra arguments for the request (e.g. headers)
+        
+        Returns:
+            Response (body empty or partial) or None if the request failed
+        """
+        response = self.head(url, allow_redirects=True, **kwargs)
+        if response is None or response.status_code not in HEAD_UNSUPPORTED:
             return response
+        
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.setdefault('Range', 'bytes=0-%d' % (PROBE_BODY_BYTES - 1))
+        return self.get(url, headers=headers, max_body_bytes=PROBE_BODY_BYTES, **kwargs)
+    
+    def warmup(self, urls: List[str], per_host: int = 10) -> int:
+        """
+        Pre-open pooled connections so the first burst of requests skips handshakes.
+        
+        Sends per_host concurrent HEAD requests to each URL, bypassing the
+        request cache, so per_host separate connections (with TLS done) are left
+        in the pool. per_host is capped at pool_maxsize, since extra connections
+        would be discarded on release.
+        
+        Args:
+            urls: One URL per host to warm up
+            per_host: Connections to open for each URL
+        
+        Returns:
+            Number of HEAD requests that got a response
+        """
+        per_host = min(per_host, self.pool_maxsize)
+        targets = [url for url in urls for _ in range(per_host)]
+        if not targets:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(len(targets), WARMUP_MAX_WORKERS)) as executor:
+            responses = list(executor.map(lambda url: self._head(url, allow_redirects=False), targets))
+        return sum(response is not None for response in responses)
+    
+    def _head(self, url: str, **kwargs) -> Optional[requests.Response]:
+        """Send a HEAD request."""
+        host = urlsplit(url).netloc.lower()
+        if self._circuit_open(host):
+            return None
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('verify', self.verify_ssl)
+        try:
+            response = self.session.head(url, **kwargs)
         except requests.exceptions.RequestException as e:
             logger.debug(f"HEAD request failed for {url}: {e}")
+            self._record_failure(host, e)
             return None
+        self._record_success(host)
+        return response
     
-    def options(self, url: str, **kwargs) -> Optional[requests.Response]:
+    def options(self, url: str, max_body_bytes: Optional[int] = None, **kwargs) -> Optional[requests.Response]:
         """Make OPTIONS request."""
+        max_body_bytes = max_body_bytes or self.max_body_bytes
+        host = urlsplit(url).netloc.lower()
+        if self._circuit_open(host):
+            return None
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('verify', self.verify_ssl)
         try:
             response = self.session.options(
                 url,
-                timeout=self.timeout,
-                verify=self.verify_ssl,
+                stream=kwargs.pop('stream', False) or bool(max_body_bytes),
                 **kwargs
             )
-            return response
-        except requests.exceptions.RequestException as e:
+            if max_body_bytes:
+                self._read_capped(response, max_body_bytes)
+        except (requests.exceptions.RequestException, URLLib3Error) as e:
             logger.debug(f"OPTIONS request failed for {url}: {e}")
+            self._record_failure(host, e)
             return None
+        self._record_success(host)
+        return response
+    
+    def _circuit_open(self, host: str) -> bool:
+        """Return True while requests to host are being short-circuited."""
+        until = self._breaker_until.get(host)
+        return until is not None and time.monotonic() < until
+    
+    def _record_failure(self, host: str, error: Exception):
+        """Count a connection-level failure and open the host's breaker at the threshold."""
+        if not self.breaker_threshold or not _is_host_failure(error):
+            return
+        with self._breaker_lock:
+            failures = self._failure_counts.get(host, 0) + 1
+            self._failure_counts[host] = failures
+            if failures >= self.breaker_threshold:
+                # After the cooldown one request is let through; if it fails
+                # too the count is still past the threshold and this reopens
+                self._breaker_until[host] = time.monotonic() + self.breaker_cooldown
+                logger.warning(
+                    f"{failures} consecutive connection failures for {host}, "
+                    f"skipping its requests for {self.breaker_cooldown}s"
+                )
+    
+    def _record_success(self, host: str):
+        """Close the host's breaker after a successful request."""
+        if host in self._failure_counts:
+            with self._breaker_lock:
+                self._failure_counts.pop(host, None)
+                self._breaker_until.pop(host, None)
+    
+    @staticmethod
+    def _capture_only(headers: Optional[Dict], max_body_bytes: Optional[int]) -> Tuple[Dict, int]:
+        """
+        Adjust a request whose body is only needed for capture_interaction.
+        
+        Asking for Accept-Encoding: identity means the capped read stops after
+        CAPTURE_BODY_LIMIT bytes off the wire, with nothing to inflate.
+        
+        Args:
+            headers: Caller's request headers
+            max_body_bytes: Caller's body cap, if any
+        
+        Returns:
+            Tuple of (headers, max_body_bytes) to send with
+        """
+        headers = dict(headers or {})
+        headers['Accept-Encoding'] = 'identity'
+        return headers, min(max_body_bytes or CAPTURE_BODY_LIMIT, CAPTURE_BODY_LIMIT)
+    
+    @staticmethod
+    def _read_capped(response: requests.Response, max_body_bytes: int) -> requests.Response:
+        """
+        Read at most max_body_bytes of a streamed response body and close it.
+        
+        The decoded (gunzipped) prefix becomes response.content, so .content and
+        .text work as usual on the shortened body. response.body_truncated tells
+        whether the server sent more.
+        
+        Args:
+            response: Response requested with stream=True
+            max_body_bytes: Maximum number of body bytes to keep
+        
+        Returns:
+            The same response, fully consumed
+        """
+        body = response.raw.read(max_body_bytes + 1, decode_content=True) or b''
+        response.body_truncated = len(body) > max_body_bytes
+        if response.body_truncated:
+            body = body[:max_body_bytes]
+        response._content = body
+        response._content_consumed = True
+        # A fully read body returns the connection to the pool; a truncated one
+        # drops it rather than draining the rest of the payload
+        response.close()
+        return response
+    
+    @staticmethod
+    def parse_json(response: requests.Response) -> Any:
+        """
+        Parse a JSON response body, with orjson when it is installed.
+        
+        Bodies orjson rejects (invalid JSON, or UTF-16/32 encoded) go through
+        response.json(), so errors are the same json.JSONDecodeError subclass.
+        
+        Args:
+            response: The Response object from requests
+        
+        Returns:
+            The decoded JSON value
+        """
+        if orjson is not None:
+            try:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                pass
+        return response.json()
+    
+    @staticmethod
+    def summarize_response(response: Optional[requests.Response]) -> Dict:
+        """
+        Convert a response into the plain dictionary used for ML anomaly detection.
+        
+        '_size' holds len(content), computed once here so feature extraction and
+        pattern analysis can read the body size without measuring it again.
+        
+        Args:
+            response: The Response object from requests
+        
+        Returns:
+            Dictionary with status, headers, content, size, timing and redirect count
+        """
+        if response is None:
+            return {}
+        
+        content = response.text
+        return {
+            'status_code': response.status_code,
+            'headers': response.headers,
+            'content': content,
+            '_size': len(content),
+            'response_time': response.elapsed.total_seconds(),
+            'redirect_count': len(response.history)
+        }
     
     @staticmethod
     def capture_interaction(
         response: Optional[requests.Response],
         request_body: Optional[str] = None,
-        start_time: Optional[float] = None
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None
     ) -> Optional[Dict]:
         """
         Capture detailed HTTP request/response information for vulnerability reports.
@@ -156,7 +806,8 @@ class HTTPClient:
         Args:
             response: The Response object from requests
             request_body: The request body (if any)
-            start_time: The time when the request started (for latency calculation)
+            start_time: time.monotonic() when the request started (for latency calculation)
+            end_time: time.monotonic() when it finished, if the caller already took it
         
         Returns:
             Dictionary with interaction details or None if response is None
@@ -168,7 +819,7 @@ class HTTPClient:
             # Calculate latency
             latency = None
             if start_time is not None:
-                latency = time.time() - start_time
+                latency = (time.monotonic() if end_time is None else end_time) - start_time
             
             # Extract request details
             request = response.request
@@ -178,32 +829,48 @@ class HTTPClient:
             # Get request headers (sanitize sensitive data)
             request_headers = {}
             if hasattr(request, 'headers'):
-                request_headers = dict(request.headers)
-                # Redact sensitive headers
-                for sensitive_key in ['Authorization', 'Cookie', 'X-API-Key', 'API-Key']:
-                    if sensitive_key in request_headers:
-                        request_headers[sensitive_key] = '[REDACTED]'
+                request_headers = {
+                    key: '[REDACTED]' if key.lower() in SENSITIVE_HEADERS else value
+                    for key, value in request.headers.items()
+                }
             
             # Get request body
             if request_body is None and hasattr(request, 'body'):
                 request_body = request.body
-                if request_body and isinstance(request_body, bytes):
-                    try:
-                        request_body = request_body.decode('utf-8', errors='replace')
-                    except:
-                        request_body = '[Binary Data]'
             
-            # Truncate large request bodies
-            if request_body and len(str(request_body)) > 5000:
-                request_body = str(request_body)[:5000] + '\n... [truncated]'
+            # Truncate large request bodies on their original type, then convert
+            # only the kept part to text. Byte bodies are decoded straight from a
+            # memoryview window, without copying the prefix out first.
+            if request_body is not None:
+                size = len(request_body) if isinstance(request_body, (bytes, bytearray)) else -1
+                if size >= 0:
+                    request_body = str(memoryview(request_body)[:CAPTURE_BODY_LIMIT], 'utf-8', 'replace')
+                else:
+                    request_body = str(request_body)
+                    size = len(request_body)
+                    request_body = request_body[:CAPTURE_BODY_LIMIT]
+                if size > CAPTURE_BODY_LIMIT:
+                    request_body += '\n... [truncated]'
+            
+            # Redact credentials carried in header lines of the body
+            if isinstance(request_body, str) and ':' in request_body:
+                request_body = SENSITIVE_LINE_RE.sub(r'\1: [REDACTED]', request_body)
             
-            # Get response body (truncated for large responses)
+            # Get response body (truncated for large responses). Only the bytes
+            # that can make up the kept characters are decoded, using the
+            # declared charset rather than response.text's full-body detection
             response_body = ''
             try:
-                if response.text:
-                    response_body = response.text
-                    if len(response_body) > 5000:
-                        response_body = response_body[:5000] + '\n... [truncated]'
+                content = response.content or b''
+                # A character is at most 4 bytes in UTF-8/UTF-16/UTF-32
+                raw = memoryview(content)[:CAPTURE_BODY_LIMIT * 4]
+                try:
+                    response_body = str(raw, response.encoding or 'utf-8', 'replace')
+                except LookupError:
+                    response_body = str(raw, 'utf-8', 'replace')
+                truncated = len(raw) < len(content) or getattr(response, 'body_truncated', False)
+                if truncated or len(response_body) > CAPTURE_BODY_LIMIT:
+                    response_body = response_body[:CAPTURE_BODY_LIMIT] + '\n... [truncated]'
             except:
                 response_body = '[Could not decode response]'
             
@@ -222,3 +889,399 @@ class HTTPClient:
         except Exception as e:
             logger.debug(f"Failed to capture interaction details: {e}")
             return None
+
+
+class _HTTPXRaw:
+    """File-like view of a streamed httpx response, standing in for urllib3's raw response."""
+    
+    def __init__(self, response):
+        self._response = response
+        self._chunks = response.iter_bytes()
+        self._buffer = b''
+    
+    def read(self, amt: Optional[int] = None, decode_content: bool = True) -> bytes:
+        """Read up to amt decoded bytes (everything if amt is None)."""
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if amt is None:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+    
+    def close(self):
+        self._response.close()
+
+
+class HTTPXSession:
+    """
+    The subset of requests.Session used by HTTPClient, implemented on httpx.Client.
+    
+    Headers, cookies and proxy are taken from a configured requests session.
+    Responses are converted to requests.Response objects so callers and
+    capture_interaction work unchanged. Connection errors and RETRY_STATUSES
+    are retried with the same backoff as the requests engine.
+    """
+    
+    def __init__(
+        self,
+        session: requests.Session,
+        timeout: float,
+        verify: bool,
+        max_retries: int,
+        http2: bool,
+        max_connections: int
+    ):
+        """Create the httpx client from a configured requests session."""
+        self.headers = session.headers
+        self.cookies = session.cookies
+        self.proxies = session.proxies
+        self.max_retries = max_retries
+        self.client = httpx.Client(
+            http2=http2,
+            verify=verify,
+            timeout=timeout,
+            proxy=self.proxies.get('https') or self.proxies.get('http'),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            # Connection-specific headers are not allowed over HTTP/2
+            headers={k: v for k, v in self.headers.items() if k.lower() != 'connection'},
+            cookies=self.cookies
+        )
+    
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        data: Any = None,
+        headers: Optional[Dict] = None,
+        json: Any = None,
+        timeout: Optional[float] = None,
+        verify: Optional[bool] = None,
+        allow_redirects: bool = True,
+        stream: bool = False,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send a request and return it as a requests.Response.
+        
+        verify is fixed when the client is created and ignored here. httpx errors
+        are re-raised as requests exceptions.
+        """
+        content = None
+        if isinstance(data, (str, bytes)):
+            content, data = data, None
+        request = self.client.build_request(
+            method, url, params=params, content=content, data=data, json=json,
+            headers=headers, timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            **kwargs
+        )
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt > 1:
+                # Same schedule as urllib3 Retry(backoff_factor=1): 0s, 2s, 4s, ...
+                time.sleep(2 ** (attempt - 1))
+            started = time.perf_counter()
+            try:
+                response = self.client.send(request, stream=True, follow_redirects=allow_redirects)
+            except httpx.ConnectTimeout as e:
+                if attempt < self.max_retries:
+                    continue
+                raise requests.exceptions.ConnectTimeout(str(e)) from e
+            except httpx.TimeoutException as e:
+                if attempt < self.max_retries:
+                    continue
+                raise requests.exceptions.ReadTimeout(str(e)) from e
+            except httpx.HTTPError as e:
+                if attempt < self.max_retries:
+                    continue
+                raise requests.exceptions.ConnectionError(str(e)) from e
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                break
+            response.close()
+        
+        elapsed = timedelta(seconds=time.perf_counter() - started)
+        try:
+            if not stream:
+                response.read()
+                response.close()
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        return self._to_requests_response(response, elapsed, stream)
+    
+    def _to_requests_response(self, response, elapsed: timedelta, stream: bool = False) -> requests.Response:
+        """Copy an httpx response into a requests.Response."""
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers.items())
+        result.url = str(response.url)
+        result.reason = response.reason_phrase
+        result.encoding = requests.utils.get_encoding_from_headers(result.headers)
+        result.elapsed = elapsed
+        result.http_version = response.http_version
+        result.history = [
+            self._to_requests_response(previous, elapsed) for previous in response.history
+        ]
+        
+        prepared = requests.PreparedRequest()
+        prepared.method = response.request.method
+        prepared.url = str(response.request.url)
+        prepared.headers = CaseInsensitiveDict(response.request.headers.items())
+        try:
+            prepared.body = response.request.content or None
+        except httpx.RequestNotRead:
+            prepared.body = None
+        result.request = prepared
+        
+        if stream:
+            result.raw = _HTTPXRaw(response)
+        else:
+            try:
+                result._content = response.content
+            except httpx.ResponseNotRead:
+                result._content = b''
+            result._content_consumed = True
+        return result
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+    
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+    
+    def options(self, url: str, **kwargs) -> requests.Response:
+        return self.request('OPTIONS', url, **kwargs)
+    
+    def close(self):
+        self.client.close()
+
+
+_shared_clients: Dict[Tuple, HTTPClient] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _freeze(value: Any) -> Any:
+    """Turn nested dicts/lists into a hashable, order-independent key; raises TypeError if impossible."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def get_shared_client(
+    proxy: Optional[str] = None,
+    custom_headers: Optional[Dict] = None,
+    cookies: Optional[Dict] = None,
+    config: Optional[Dict] = None
+) -> HTTPClient:
+    """
+    Return the process-wide HTTPClient for these settings, creating it on first use.
+    
+    Modules asking for the same proxy, headers, cookies and config share one
+    session, so keep-alive connections (and their TCP/TLS handshakes) are reused
+    across the whole scan. Shared sessions are closed at interpreter exit.
+    
+    Args:
+        proxy: Proxy URL
+        custom_headers: Extra request headers
+        cookies: Session cookies
+        config: Deep Eye configuration
+    
+    Returns:
+        HTTPClient instance (a private one if the settings cannot be hashed)
+    """
+    try:
+        key = (proxy, _freeze(custom_headers or {}), _freeze(cookies or {}), _freeze(config or {}))
+    except TypeError:
+        return HTTPClient(proxy=proxy, custom_headers=custom_headers, cookies=cookies, config=config)
+    
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = _shared_clients[key] = HTTPClient(
+                proxy=proxy, custom_headers=custom_headers, cookies=cookies, config=config
+            )
+        return client
+
+
+@atexit.register
+def close_shared_clients():
+    """Close every session handed out by get_shared_client()."""
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        client.close()
+
+
+class AsyncHTTPClient:
+    """
+    aiohttp-based client for issuing many requests concurrently on one event loop.
+    
+    Reads the same scanner settings as HTTPClient. Responses are returned with
+    their body already read, so status, headers and ``await response.text()``
+    remain usable after the request completes.
+    """
+    
+    def __init__(
+        self,
+        proxy: Optional[str] = None,
+        custom_headers: Optional[Dict] = None,
+        cookies: Optional[Dict] = None,
+        config: Optional[Dict] = None
+    ):
+        """Initialize async HTTP client."""
+        self.config = config or {}
+        scanner_config = self.config.get('scanner', {})
+        
+        self.timeout = scanner_config.get('timeout', 10)
+        self.verify_ssl = scanner_config.get('verify_ssl', True)
+        self.max_retries = scanner_config.get('max_retries', 3)
+        self.user_agent = scanner_config.get('user_agent', 'Deep-Eye/1.0')
+        self.connection_limit = scanner_config.get('async_connection_limit', 200)
+        self.connection_limit_per_host = scanner_config.get('async_connection_limit_per_host', 20)
+        self.dns_cache_ttl = (
+            scanner_config.get('dns_cache_ttl', 300) if scanner_config.get('dns_cache', True) else None
+        )
+        
+        self.proxy = proxy
+        self.cookies = cookies
+        self.headers = {
+            'User-Agent': self.user_agent,
+            'Accept': '*/*',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate'
+        }
+        if custom_headers:
+            self.headers.update(custom_headers)
+        
+        # Created lazily: an aiohttp session is bound to the running event loop
+        self.session = None
+    
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _ensure_session(self):
+        """Create the underlying aiohttp session on first use."""
+        if self.session is None or self.session.closed:
+            if aiohttp is None:
+                raise RuntimeError("aiohttp is required for AsyncHTTPClient")
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit,
+                    limit_per_host=self.connection_limit_per_host,
+                    use_dns_cache=self.dns_cache_ttl is not None,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    ssl=None if self.verify_ssl else False
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers,
+                cookies=self.cookies
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the session and release pooled connections."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+    
+    async def request(self, method: str, url: str, **kwargs):
+        """
+        Make a request, retrying connection errors and retryable statuses with backoff.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Extra arguments for aiohttp.ClientSession.request
+        
+        Returns:
+            aiohttp.ClientResponse with its body read, or None if the request failed
+        """
+        session = await self._ensure_session()
+        if self.proxy:
+            kwargs.setdefault('proxy', self.proxy)
+        
+        response = None
+        for attempt in range(self.max_retries + 1):
+            if attempt > 1:
+                # Same schedule as urllib3 Retry(backoff_factor=1): 0s, 2s, 4s, ...
+                await asyncio.sleep(2 ** (attempt - 1))
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.debug(f"{method} request failed for {url}: {e}")
+                response = None
+                continue
+            if response.status not in RETRY_STATUSES:
+                break
+        return response
+    
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        allow_redirects: bool = True,
+        **kwargs
+    ):
+        """Make GET request."""
+        return await self.request(
+            'GET', url, params=params, headers=headers, allow_redirects=allow_redirects, **kwargs
+        )
+    
+    async def post(
+        self,
+        url: str,
+        data: Optional[Dict] = None,
+        json: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        **kwargs
+    ):
+        """Make POST request."""
+        return await self.request('POST', url, data=data, json=json, headers=headers, **kwargs)
+    
+    async def head(self, url: str, **kwargs):
+        """Make HEAD request."""
+        return await self.request('HEAD', url, **kwargs)
+    
+    async def options(self, url: str, **kwargs):
+        """Make OPTIONS request."""
+        return await self.request('OPTIONS', url, **kwargs)
+    
+    async def batch_get(self, urls: List[str], **kwargs) -> List:
+        """
+        GET many URLs concurrently.
+        
+        Args:
+            urls: URLs to fetch
+            **kwargs: Extra arguments passed to every get()
+        
+        Returns:
+            Responses (or None / the raised exception) in the same order as urls
+        """
+        return await asyncio.gather(*[self.get(url, **kwargs) for url in urls], return_exceptions=True)
+    
+    def batch_get_sync(self, urls: List[str], **kwargs) -> List:
+        """Run batch_get() to completion from synchronous code."""
+        async def run():
+            try:
+                return await self.batch_get(urls, **kwargs)
+            finally:
+                await self.close()
+        
+        return asyncio.run(run())